@@ -11,11 +11,18 @@ The output is a comprehensive CSV report detailing all findings for the day.
 V4: Reads a two-column (Ticker, Strategy) live portfolio CSV.
 """
 
+import csv
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
 import json
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from itertools import repeat
+from typing import Callable, NamedTuple, Optional
 from tqdm import tqdm
 
 from data_manager import DataManager
@@ -37,44 +44,132 @@ logger = logging.getLogger(__name__)
 ETF_UNIVERSE_PATH = "configs/etf_universe.csv"
 LIVE_PORTFOLIO_PATH = "data/live_portfolio.csv"
 
+def _sma_5_exit_cond(latest: dict) -> str:
+    """Describes an exit on a close through the 5-day SMA."""
+    return f"Close vs SMA_5: {round(latest['SMA_5'], 2)}"
+
+# "exit_cond" builds the report's exit description from the latest bar's values.
+# "emits" lists the signal keys the scan reads from each strategy's result.
 STRATEGY_MAP = {
     "3_day_hl": {
         "func": check_three_day_hl_conditions,
+        "long_entry_key": "long_signal",
+        "short_entry_key": "short_signal",
         "indicators": ["SMA_5"],
-        "entry_desc": "3 consecutive lower highs/lows (long) or higher highs/lows (short)"
+        "entry_desc": "3 consecutive lower highs/lows (long) or higher highs/lows (short)",
+        "exit_cond": _sma_5_exit_cond,
+        "emits": frozenset({"long_signal", "short_signal"})
     },
     "rsi_25_75": {
         "func": check_rsi_25_75_conditions,
+        "long_entry_key": "long_entry",
+        "short_entry_key": "short_entry",
         "indicators": ["RSI_4"],
-        "entry_desc": "RSI(4) < 25 (long) or > 75 (short)"
+        "entry_desc": "RSI(4) < 25 (long) or > 75 (short)",
+        "exit_cond": lambda latest: "RSI(4) > 55 (long) or < 45 (short)",
+        "emits": frozenset({"long_entry", "short_entry", "long_exit", "short_exit", "long_aggressive_entry", "short_aggressive_entry"})
     },
     "r3": {
         "func": check_r3_conditions,
+        "long_entry_key": "long_entry",
+        "short_entry_key": "short_entry",
         "indicators": ["RSI_2"],
-        "entry_desc": "RSI(2) drops 3 days & < 10 (long) or rises 3 days & > 90 (short)"
+        "entry_desc": "RSI(2) drops 3 days & < 10 (long) or rises 3 days & > 90 (short)",
+        "exit_cond": lambda latest: "RSI(2) > 70 (long) or < 30 (short)",
+        "emits": frozenset({"long_entry", "short_entry", "long_exit", "short_exit"})
     },
     "percent_b": {
         "func": check_percent_b_conditions,
+        "long_entry_key": "long_entry",
+        "short_entry_key": "short_entry",
         "indicators": ["%b"],
-        "entry_desc": "%b < 0.2 for 3 days (long) or > 0.8 for 3 days (short)"
+        "entry_desc": "%b < 0.2 for 3 days (long) or > 0.8 for 3 days (short)",
+        "exit_cond": lambda latest: "%b > 0.8 (long) or < 0.2 (short)",
+        "emits": frozenset({"long_entry", "short_entry", "long_exit", "short_exit"})
     },
     "mdd_mdu": {
         "func": check_mdd_mdu_conditions,
+        "long_entry_key": "long_entry",
+        "short_entry_key": "short_entry",
         "indicators": ["SMA_5"],
-        "entry_desc": "4 of 5 last days close lower (long) or higher (short)"
+        "entry_desc": "4 of 5 last days close lower (long) or higher (short)",
+        "exit_cond": _sma_5_exit_cond,
+        "emits": frozenset({"long_entry", "short_entry", "long_exit", "short_exit"})
     },
     "rsi_10_6_90_94": {
         "func": check_rsi_10_6_90_94_conditions,
+        "long_entry_key": "long_initial_entry",
+        "short_entry_key": "short_initial_entry",
         "indicators": ["RSI_2", "SMA_5"],
-        "entry_desc": "RSI(2) < 10 (long) or > 90 (short)"
+        "entry_desc": "RSI(2) < 10 (long) or > 90 (short)",
+        "exit_cond": _sma_5_exit_cond,
+        "emits": frozenset({"long_initial_entry", "short_initial_entry", "long_exit", "short_exit"})
     },
     "tps": {
         "func": check_tps_conditions,
+        # TPS reports entries through its "signal"/"tranche_to_execute" fields instead
+        "long_entry_key": None,
+        "short_entry_key": None,
         "indicators": ["RSI_2"],
-        "entry_desc": "RSI(2) < 25 for 2 days (long) or > 75 for 2 days (short)"
+        "entry_desc": "RSI(2) < 25 for 2 days (long) or > 75 for 2 days (short)",
+        "exit_cond": lambda latest: "RSI(2) > 70 (long) or < 30 (short)",
+        "emits": frozenset()
     },
 }
 
+# Signals read for an open position, by side
+_HOLDING_SIGNALS = {
+    "long": {"long_exit", "long_aggressive_entry"},
+    "short": {"short_exit", "short_aggressive_entry"},
+}
+
+def _has_signal(signals: Optional[NamedTuple], key: Optional[str]) -> bool:
+    """
+    Reads one boolean signal from a strategy's result tuple. Signals the strategy
+    does not emit, or a skipped check (None), read as False.
+    """
+    return key is not None and getattr(signals, key, False)
+
+def _make_scanner(strategy_name: str, strategy_info: dict) -> Callable[[pd.DataFrame, dict], NamedTuple]:
+    """
+    Builds a function that runs one strategy against a symbol's indicator frame
+    and its live-portfolio row, so the per-strategy dispatch is decided once here
+    rather than on every call.
+    """
+    strategy_func = strategy_info["func"]
+    if strategy_name == 'tps':
+        # The TPS strategy is stateful and requires the position dictionary,
+        # reformatted slightly from the live portfolio row. One dict is reused
+        # for every call: each worker process has its own copy and scans one
+        # symbol at a time, and TPS only reads it.
+        tps_position_state = {'is_open': False, 'side': None, 'tranches_filled': 0, 'last_entry_price': 0.0}
+
+        def scan(data: pd.DataFrame, position: dict) -> NamedTuple:
+            tps_position_state['is_open'] = bool(position)
+            tps_position_state['side'] = position.get('Side')
+            tps_position_state['tranches_filled'] = position.get('TranchesFilled', 0)
+            tps_position_state['last_entry_price'] = position.get('EntryPrice', 0.0)
+            return strategy_func(data, tps_position_state)
+    else:
+        def scan(data: pd.DataFrame, position: dict) -> NamedTuple:
+            return strategy_func(data)
+    return scan
+
+SCANNERS = {name: _make_scanner(name, info) for name, info in STRATEGY_MAP.items()}
+
+# Columns read from the latest bar when building the report rows
+REPORT_COLUMNS = sorted({"Close"}.union(*(info["indicators"] for info in STRATEGY_MAP.values())))
+
+# Columns of the daily scan report, in output order
+RESULT_COLUMNS = (
+    "Date", "Symbol", "Strategy", "Current Price", "Signal Type", "Status",
+    "Entry Price", "Entry Condition", "Exit Condition/Value", "Key Indicator Value"
+)
+# "Entry Price" mixes "N/A" with prices, so it is stored as text
+RESULT_SCHEMA = pa.schema([
+    (col, pa.float64() if col == "Current Price" else pa.string()) for col in RESULT_COLUMNS
+])
+
 # --- Helper Functions ---
 
 def load_etf_universe(filepath: str) -> list[str]:
@@ -82,7 +177,9 @@ def load_etf_universe(filepath: str) -> list[str]:
     if not os.path.exists(filepath):
         logging.error(f"ETF universe file not found at {filepath}.")
         return []
-    return pd.read_csv(filepath)['Symbol'].tolist()
+    # A one-column list of symbols does not need a DataFrame
+    with open(filepath, newline='') as f:
+        return [row['Symbol'] for row in csv.DictReader(f) if row.get('Symbol')]
 
 def load_live_portfolio_from_csv(filepath: str) -> dict:
     """
@@ -96,20 +193,115 @@ def load_live_portfolio_from_csv(filepath: str) -> dict:
     
     try:
         df = pd.read_csv(filepath)
-        portfolio_dict = {}
-        for index, row in df.iterrows():
-            # Create the composite key that the rest of the script uses
-            key = f"{row['Ticker']}_{row['Strategy']}"
-            # Store the rest of the row's data as the value
-            portfolio_dict[key] = row.to_dict()
-        return portfolio_dict
+        # Create the composite key that the rest of the script uses and store
+        # each row's data as the value. Later rows win if a key is repeated.
+        df['__key'] = df['Ticker'].astype(str) + '_' + df['Strategy'].astype(str)
+        df = df.drop_duplicates(subset='__key', keep='last')
+        return df.set_index('__key').to_dict(orient='index')
     except Exception as e:
         logging.error(f"Error loading portfolio from {filepath}: {e}")
         return {}
 
 
-def run_daily_scanner():
-    """Main function to run the daily strategy scanner."""
+def _scan_one(symbol: str, historical_data: pd.DataFrame, live_portfolio: dict, today_str: str) -> list[tuple]:
+    """
+    Evaluates every strategy against a single symbol's pre-fetched history.
+
+    Returns one result row per strategy as a tuple in RESULT_COLUMNS order, or
+    an empty list if the symbol does not have enough history to be scanned.
+    """
+    if len(historical_data) < 200:
+        logging.warning(f"Insufficient data for {symbol} (need 200 days). Skipping.")
+        return []
+
+    data_with_indicators = calculate_indicators(historical_data)
+    # Pull the report columns out as plain arrays once, rather than building a
+    # pandas row and indexing it repeatedly for every strategy.
+    arrays = {
+        col: data_with_indicators[col].to_numpy()
+        for col in REPORT_COLUMNS if col in data_with_indicators.columns
+    }
+    latest_values = {col: values[-1] for col, values in arrays.items()}
+    close_last = round(latest_values['Close'], 2)
+    symbol_results = []
+
+    for strategy_name, strategy_info in STRATEGY_MAP.items():
+        portfolio_key = f"{symbol}_{strategy_name}"
+        position = live_portfolio.get(portfolio_key, {})
+
+        # Only the signals that can change this row are worth computing: entries
+        # when flat, or the exit/scale-in signals for the side being held.
+        if not position:
+            needed = {strategy_info["long_entry_key"], strategy_info["short_entry_key"]}
+        else:
+            needed = _HOLDING_SIGNALS.get(position['Side'], set())
+
+        if strategy_info["emits"].isdisjoint(needed):
+            signals = None
+        else:
+            signals = SCANNERS[strategy_name](data_with_indicators, position)
+
+        signal_type = "None"
+        status = "No Signal"
+        entry_price = "N/A"
+        key_indicator_value = "N/A"
+
+        primary_indicator = strategy_info["indicators"][0]
+        if primary_indicator in latest_values:
+            key_indicator_value = f"{primary_indicator}: {round(latest_values[primary_indicator], 2)}"
+
+        if not position: # If position is an empty dictionary, no trade is open
+            if _has_signal(signals, strategy_info["long_entry_key"]):
+                status = "TRIGGERED"
+                signal_type = "Long Entry"
+                entry_price = close_last
+            elif _has_signal(signals, strategy_info["short_entry_key"]):
+                status = "TRIGGERED"
+                signal_type = "Short Entry"
+                entry_price = close_last
+
+        else: # A position exists for this key
+            status = "HOLDING"
+            signal_type = f"Holding {position['Side'].upper()}"
+            entry_price = position['EntryPrice']
+
+            if (position['Side'] == 'long' and _has_signal(signals, 'long_exit')) or \
+               (position['Side'] == 'short' and _has_signal(signals, 'short_exit')):
+                status = "EXIT SIGNAL"
+                signal_type = f"Exit {position['Side'].upper()}"
+
+            elif (position['Side'] == 'long' and _has_signal(signals, 'long_aggressive_entry')) or \
+                 (position['Side'] == 'short' and _has_signal(signals, 'short_aggressive_entry')):
+                status = "AGGRESSIVE ENTRY"
+                signal_type = f"Scale-In {position['Side'].upper()}"
+
+        exit_condition = strategy_info["exit_cond"](latest_values)
+
+        # Rows are plain tuples in RESULT_COLUMNS order
+        symbol_results.append((
+            today_str, symbol, strategy_name, close_last, signal_type, status,
+            entry_price, strategy_info["entry_desc"], exit_condition, key_indicator_value
+        ))
+
+    return symbol_results
+
+
+def _rows_to_table(rows: list[tuple]) -> pa.Table:
+    """Converts result tuples into an Arrow table with the report schema."""
+    columns = [list(values) for values in zip(*rows)]
+    entry_price = RESULT_COLUMNS.index("Entry Price")
+    columns[entry_price] = [str(value) for value in columns[entry_price]]
+    return pa.Table.from_arrays(columns, schema=RESULT_SCHEMA)
+
+
+def run_daily_scanner(max_workers: Optional[int] = None):
+    """
+    Main function to run the daily strategy scanner.
+
+    Args:
+        max_workers (Optional[int]): Number of worker processes that scan symbols.
+                                     Defaults to the number of CPUs.
+    """
     logging.info("Starting Daily ETF Scanner...")
     
     etf_symbols = load_etf_universe(ETF_UNIVERSE_PATH)
@@ -119,94 +311,36 @@ def run_daily_scanner():
 
     live_portfolio = load_live_portfolio_from_csv(LIVE_PORTFOLIO_PATH)
     data_manager = DataManager()
-    scan_results = []
-
-    for symbol in tqdm(etf_symbols, desc="Scanning ETFs"):
-        historical_data = data_manager.get_historical_data(symbol, period="1y")
-        if len(historical_data) < 200:
-            logging.warning(f"Insufficient data for {symbol} (need 200 days). Skipping.")
-            continue
-
-        data_with_indicators = calculate_indicators(historical_data)
-        latest_data = data_with_indicators.iloc[-1]
-        
-        for strategy_name, strategy_info in STRATEGY_MAP.items():
-            strategy_func = strategy_info["func"]
-            portfolio_key = f"{symbol}_{strategy_name}"
-            position = live_portfolio.get(portfolio_key, {})
-
-            # The TPS strategy is stateful and requires the position dictionary
-            if strategy_name == 'tps':
-                # Reformat the position dictionary slightly for the TPS function
-                tps_position_state = {
-                    'is_open': bool(position),
-                    'side': position.get('Side'),
-                    'tranches_filled': position.get('TranchesFilled', 0),
-                    'last_entry_price': position.get('EntryPrice', 0.0)
-                }
-                signals = strategy_func(data_with_indicators, tps_position_state)
-            else:
-                signals = strategy_func(data_with_indicators)
-
-            result_row = {
-                "Date": datetime.now().strftime('%Y-%m-%d'),
-                "Symbol": symbol,
-                "Strategy": strategy_name,
-                "Current Price": round(latest_data['Close'], 2),
-                "Signal Type": "None",
-                "Status": "No Signal",
-                "Entry Price": "N/A",
-                "Entry Condition": strategy_info["entry_desc"],
-                "Exit Condition/Value": "N/A",
-                "Key Indicator Value": "N/A"
-            }
-
-            primary_indicator = strategy_info["indicators"][0]
-            if primary_indicator in latest_data:
-                result_row["Key Indicator Value"] = f"{primary_indicator}: {round(latest_data[primary_indicator], 2)}"
-
-            if not position: # If position is an empty dictionary, no trade is open
-                if signals.get('long_entry') or signals.get('long_signal') or signals.get('long_initial_entry'):
-                    result_row["Status"] = "TRIGGERED"
-                    result_row["Signal Type"] = "Long Entry"
-                    result_row["Entry Price"] = round(latest_data['Close'], 2)
-                elif signals.get('short_entry') or signals.get('short_signal') or signals.get('short_initial_entry'):
-                    result_row["Status"] = "TRIGGERED"
-                    result_row["Signal Type"] = "Short Entry"
-                    result_row["Entry Price"] = round(latest_data['Close'], 2)
-            
-            else: # A position exists for this key
-                result_row["Status"] = "HOLDING"
-                result_row["Signal Type"] = f"Holding {position['Side'].upper()}"
-                result_row["Entry Price"] = position['EntryPrice']
-                
-                if (position['Side'] == 'long' and signals.get('long_exit')) or \
-                   (position['Side'] == 'short' and signals.get('short_exit')):
-                    result_row["Status"] = "EXIT SIGNAL"
-                    result_row["Signal Type"] = f"Exit {position['Side'].upper()}"
-                
-                elif (position['Side'] == 'long' and signals.get('long_aggressive_entry')) or \
-                     (position['Side'] == 'short' and signals.get('short_aggressive_entry')):
-                    result_row["Status"] = "AGGRESSIVE ENTRY"
-                    result_row["Signal Type"] = f"Scale-In {position['Side'].upper()}"
-
-            if "SMA_5" in strategy_info["indicators"]:
-                result_row["Exit Condition/Value"] = f"Close vs SMA_5: {round(latest_data['SMA_5'], 2)}"
-            elif "RSI_4" in strategy_info["indicators"]:
-                result_row["Exit Condition/Value"] = "RSI(4) > 55 (long) or < 45 (short)"
-            elif "RSI_2" in strategy_info["indicators"]:
-                 result_row["Exit Condition/Value"] = "RSI(2) > 70 (long) or < 30 (short)"
-            elif "%b" in strategy_info["indicators"]:
-                 result_row["Exit Condition/Value"] = "%b > 0.8 (long) or < 0.2 (short)"
-            
-            scan_results.append(result_row)
-
-    results_df = pd.DataFrame(scan_results)
     today_str = datetime.now().strftime('%Y-%m-%d')
     output_path = f"data/daily_scan_results_{today_str}.csv"
-    results_df.to_csv(output_path, index=False)
+    parquet_path = f"data/daily_scan_results_{today_str}.parquet"
+
+    # Fetch the whole universe up front in batched requests; the scan itself
+    # then runs purely in memory.
+    historical_data = data_manager.get_historical_data_batch(etf_symbols, period="1y")
+
+    # Symbols share no state, so they are scanned in worker processes. map()
+    # yields results in input order, so the report order does not depend on
+    # which worker finishes first.
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(etf_symbols)))
+    chunksize = max(1, len(etf_symbols) // (workers * 4))
+
+    # Each symbol's rows are written as they arrive, one Parquet row group per
+    # symbol, so the full report is never held in memory.
+    with pq.ParquetWriter(parquet_path, RESULT_SCHEMA, compression='zstd') as writer, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(
+            _scan_one, etf_symbols, (historical_data[symbol] for symbol in etf_symbols),
+            repeat(live_portfolio), repeat(today_str), chunksize=chunksize
+        )
+        for symbol_rows in tqdm(results, total=len(etf_symbols), desc="Scanning ETFs"):
+            if symbol_rows:
+                writer.write_table(_rows_to_table(symbol_rows))
+
+    # Keep the CSV report for anyone reading it by hand or in a spreadsheet
+    pa_csv.write_csv(pq.read_table(parquet_path), output_path)
 
-    logging.info(f"Daily scan complete. Results saved to {output_path}")
+    logging.info(f"Daily scan complete. Results saved to {output_path} and {parquet_path}")
 
 if __name__ == "__main__":
     if not os.path.exists('data'):
@@ -21,10 +21,15 @@ class DataManager:
         Initializes the DataManager.
         """
         # self.polygon_handler = PolygonAPIHandlerHistorical(api_key="YOUR_POLYGON_API_KEY") # This line is not used in the e2e test
-        self.yfinance_handler = YFinanceHandler(logger=logger) # Pass the logger instance here
         self.cache_dir = cache_dir
         if not os.path.exists(self.cache_dir):
             os.makedirs(self.cache_dir)
+        # Directories already created by _get_file_path, to avoid repeated checks
+        self._known_dirs: set[str] = set()
+        self.yfinance_handler = YFinanceHandler(
+            logger=logger, # Pass the logger instance here
+            cache_dir=os.path.join(self.cache_dir, 'yfinance', 'history')
+        )
 
     def get_historical_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """
@@ -39,14 +44,29 @@ class DataManager:
             logger.error(f"Error fetching data for {symbol} from yfinance: {e}")
             return pd.DataFrame()
 
+    def get_historical_data_batch(
+        self, symbols: list[str], period: str = "1y", interval: str = "1d"
+    ) -> dict[str, pd.DataFrame]:
+        """
+        Fetches historical data for many symbols at once using batched yfinance requests.
+        Symbols that could not be fetched map to an empty DataFrame.
+        """
+        logger.info(f"Fetching historical data for {len(symbols)} symbols using yfinance.")
+        try:
+            return self.yfinance_handler.get_historical_batch(symbols, period, interval)
+        except Exception as e:
+            logger.error(f"Error fetching batch data from yfinance: {e}")
+            return {symbol: pd.DataFrame() for symbol in symbols}
+
     def _get_file_path(self, ticker: str, source: str) -> str:
         """
         Constructs the full path for a ticker's data file, including the source.
         Example: data/polygon/daily/SPY.parquet
         """
         source_path = os.path.join(self.base_data_path, source, 'daily')
-        if not os.path.exists(source_path):
-            os.makedirs(source_path)
+        if source_path not in self._known_dirs:
+            os.makedirs(source_path, exist_ok=True)
+            self._known_dirs.add(source_path)
         return os.path.join(source_path, f"{ticker.upper()}.parquet")
 
     async def get_daily_stock_data(
@@ -112,9 +132,14 @@ class DataManager:
                         ticker, fetch_start_date.strftime('%Y-%m-%d'), end_date
                     )
                 
+                # Collect every piece first and concatenate once, so adding more
+                # fetch windows later does not copy the whole frame per append.
+                chunks = [local_df]
                 if new_data_df is not None and not new_data_df.empty:
-                    local_df = pd.concat([local_df, new_data_df])
-                    local_df = local_df[~local_df.index.duplicated(keep='last')]
+                    chunks.append(new_data_df)
+                if len(chunks) > 1:
+                    local_df = pd.concat(chunks)
+                    local_df = local_df.loc[~local_df.index.duplicated(keep='last')]
                     self._save_data(ticker, source, local_df)
         else:
             # No local data, so fetch the full range
@@ -4,29 +4,108 @@
 A handler to interact with the yfinance library for fetching historical market data.
 """
 
+import os
+import re
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import requests
 import yfinance as yf
 import logging
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from pandas.tseries.offsets import BDay
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:  # yfinance can fall back to plain requests
+    curl_requests = None
+
+_PERIOD_PATTERN = re.compile(r"^(\d+)(d|wk|mo|y)$")
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+# Parquet decoding releases the GIL, so cache files can be read in parallel
+_CACHE_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+# The columns of every history frame, whichever download path produced it
+_HISTORY_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume', 'Dividends', 'Stock Splits']
+# Parquet metadata key holding the start of the last full-period download, so a
+# symbol with less history than the period still counts as covering it
+_HISTORY_START_KEY = b"history_start"
+
+
+def _period_to_offset(period: str) -> Optional[pd.DateOffset]:
+    """
+    Converts a yfinance period string (e.g. "5d", "1mo", "1y") to a DateOffset.
+    Returns None for periods that have no fixed length, such as "max" or "ytd".
+    """
+    match = _PERIOD_PATTERN.match(period)
+    if not match:
+        return None
+    amount, unit = match.groups()
+    return pd.DateOffset(**{_PERIOD_UNITS[unit]: int(amount)})
+
+
+def _normalize_history(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gives a downloaded history the columns in _HISTORY_COLUMNS, so `yf.download`
+    and `Ticker.history` results share one cache schema. Missing corporate-action
+    columns are filled with 0, and extra columns such as 'Capital Gains' are dropped.
+    """
+    if data.empty:
+        return data
+    return data.reindex(columns=_HISTORY_COLUMNS, fill_value=0.0)
+
+
+def _new_session(pool_size: int = 32) -> Any:
+    """
+    Creates an HTTP session to share across all yfinance requests, so connections
+    to Yahoo Finance are kept alive and reused instead of re-negotiated per ticker.
+    Prefers curl_cffi (which yfinance recommends) and falls back to requests
+    with a connection pool large enough for threaded batch downloads.
+    """
+    if curl_requests is not None:
+        return curl_requests.Session(impersonate="chrome")
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 
 class YFinanceHandler:
     """
     A wrapper class for the yfinance library to standardize data fetching.
     """
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None, cache_dir: Optional[str] = None):
         """
         Initializes the YFinanceHandler.
 
         Args:
             logger (Optional[logging.Logger]): An optional logger instance.
                                                If None, a default logger is created.
+            cache_dir (Optional[str]): Directory for the Parquet history cache.
+                                       If None, every request goes to Yahoo Finance.
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.cache_dir = cache_dir
+        if self.cache_dir and not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        if self.cache_dir:
+            # Persist yfinance's timezone lookups next to the history cache
+            yf.set_tz_cache_location(os.path.join(self.cache_dir, "tz"))
+        self.session = _new_session()
 
     def get_historical_data(self, symbol: str, period: str = "1y", interval: str = "1d") -> pd.DataFrame:
         """
         Fetches historical data for a given symbol from Yahoo Finance.
 
+        When a cache directory is configured, the history is kept in a local Parquet
+        file and only the bars missing since the last cached date are downloaded.
+        The cache is refreshed at most once per day. Prices are split- and
+        dividend-adjusted, so when a new bar carries a dividend or split the whole
+        period is downloaded again rather than appended to bars adjusted before it.
+
         Args:
             symbol (str): The ticker symbol to fetch data for.
             period (str): The period of data to fetch (e.g., "1d", "5d", "1mo", "1y", "max").
@@ -36,17 +115,334 @@ class YFinanceHandler:
             pd.DataFrame: A DataFrame containing the historical data, or an empty
                           DataFrame if an error occurs.
         """
-        self.logger.info(f"Fetching {period} of {interval} data for {symbol} from yfinance.")
+        offset = _period_to_offset(period)
+        if not self.cache_dir or offset is None:
+            return self._download_history(symbol, period, interval)
+
+        file_path = self._get_cache_path(symbol, interval)
+        period_start = pd.Timestamp.now().normalize() - offset
+        cached = self._read_usable_cache(file_path, period_start)
+
+        if cached is None:
+            return self._download_full_history(file_path, symbol, period, interval, period_start)
+
+        last_cached_date = cached.index[-1].date()
+        if not self._is_cache_current(file_path, last_cached_date):
+            # Re-request the last cached bar as well, since it may have been partial.
+            new_data = self._download_history(symbol, interval=interval, start=last_cached_date)
+            cached = self._append_to_cache(file_path, cached, new_data)
+            if cached is None:
+                return self._download_full_history(file_path, symbol, period, interval, period_start)
+
+        return cached[cached.index.tz_localize(None) >= period_start]
+
+    def get_historical_batch(
+        self, symbols: List[str], period: str = "1y", interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetches historical data for many symbols with as few requests as possible.
+
+        Symbols whose Parquet cache is current are served locally. The rest are
+        downloaded with batched `yf.download` calls: one per distinct last-cached
+        date for stale caches (only the bars since that date), then one for symbols
+        with no usable cache (the full period). Stale symbols whose new bars carry a
+        dividend or split join the full-period download, since their cached bars
+        were adjusted before it.
+
+        Args:
+            symbols (List[str]): The ticker symbols to fetch data for.
+            period (str): The period of data to fetch (e.g., "1mo", "1y", "max").
+            interval (str): The data interval (e.g., "1h", "1d").
+
+        Returns:
+            Dict[str, pd.DataFrame]: The history for each requested symbol, in request
+                                     order. Symbols that could not be fetched map to
+                                     an empty DataFrame.
+        """
+        offset = _period_to_offset(period)
+        if not self.cache_dir or offset is None:
+            downloaded = self._download_batch(symbols, period=period, interval=interval)
+            return {symbol: downloaded.get(symbol, pd.DataFrame()) for symbol in symbols}
+
+        period_start = pd.Timestamp.now().normalize() - offset
+        results: Dict[str, pd.DataFrame] = {}
+        missing: List[str] = []
+        current: List[str] = []
+        stale_by_date: Dict[date, List[str]] = {}
+
+        # Classify symbols from each cache file's Parquet footer, without reading any
+        # rows: the first bar decides whether the cache covers the period, and the
+        # last bar with the file's modification time whether it is current. Stale
+        # caches usually all end on the same bar; grouping them by it keeps a symbol
+        # that fell further behind from widening everyone's request.
+        file_paths = {symbol: self._get_cache_path(symbol, interval) for symbol in symbols}
+        for symbol, file_path in file_paths.items():
+            date_range = self._cache_date_range(file_path)
+            if date_range is None or not self._cache_covers_period(file_path, date_range[0], period_start):
+                missing.append(symbol)
+            elif self._is_cache_current(file_path, date_range[1].date()):
+                current.append(symbol)
+            else:
+                stale_by_date.setdefault(date_range[1].date(), []).append(symbol)
+
+        # Current caches are returned and stale ones appended to, so both are read
+        # in full; missing ones never are.
+        readable = current + [symbol for group in stale_by_date.values() for symbol in group]
+        all_cached = self._read_caches([file_paths[symbol] for symbol in readable])
+        unreadable = {
+            symbol for symbol in readable
+            if all_cached[file_paths[symbol]] is None or all_cached[file_paths[symbol]].empty
+        }
+        missing.extend(symbol for symbol in readable if symbol in unreadable)
+        for symbol in current:
+            if symbol not in unreadable:
+                results[symbol] = all_cached[file_paths[symbol]]
+
+        for start, group in stale_by_date.items():
+            group = [symbol for symbol in group if symbol not in unreadable]
+            if not group:
+                continue
+            downloaded = self._download_batch(group, interval=interval, start=start)
+            for symbol in group:
+                file_path = file_paths[symbol]
+                merged = self._append_to_cache(file_path, all_cached[file_path], downloaded.get(symbol))
+                if merged is None:
+                    missing.append(symbol)
+                else:
+                    results[symbol] = merged
+
+        if missing:
+            for symbol, data in self._download_batch(missing, period=period, interval=interval).items():
+                self._write_cache(self._get_cache_path(symbol, interval), data, history_start=period_start)
+                results[symbol] = data
+
+        return {
+            symbol: results[symbol][results[symbol].index.tz_localize(None) >= period_start]
+            if symbol in results else pd.DataFrame()
+            for symbol in symbols
+        }
+
+    def _download_batch(
+        self,
+        symbols: List[str],
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[date] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Downloads several symbols in a single `yf.download` request. Corporate
+        actions are requested too, so the frames match `_download_history`.
+        """
+        window = f"{period}" if start is None else f"data since {start}"
+        self.logger.info(f"Fetching {window} of {interval} data for {len(symbols)} symbols from yfinance.")
         try:
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period, interval=interval)
+            data = yf.download(
+                symbols, period=period, start=start, interval=interval,
+                group_by='ticker', threads=True, progress=False, actions=True,
+                auto_adjust=True, ignore_tz=False, session=self.session
+            )
+        except Exception as e:
+            self.logger.error(f"An error occurred while fetching batch data: {e}")
+            return {}
+
+        if data is None or data.empty:
+            self.logger.warning(f"No data found for batch of {len(symbols)} symbols ({window}).")
+            return {}
+        if not isinstance(data.columns, pd.MultiIndex):
+            return {symbols[0]: _normalize_history(data)}
+
+        frames: Dict[str, pd.DataFrame] = {}
+        available = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in available:
+                self.logger.warning(f"No data found for symbol {symbol} ({window}).")
+                continue
+            # Rows are aligned across tickers, so drop dates this symbol did not trade
+            frame = data[symbol].dropna(how='all')
+            frame.columns.name = None
+            if not frame.empty:
+                frames[symbol] = _normalize_history(frame)
+        return frames
+
+    def _download_history(
+        self,
+        symbol: str,
+        period: Optional[str] = None,
+        interval: str = "1d",
+        start: Optional[date] = None
+    ) -> pd.DataFrame:
+        """Downloads history for a symbol, either for a period or from a start date."""
+        window = f"{period}" if start is None else f"data since {start}"
+        self.logger.info(f"Fetching {window} of {interval} data for {symbol} from yfinance.")
+        try:
+            ticker = yf.Ticker(symbol, session=self.session)
+            if start is None:
+                data = ticker.history(period=period, interval=interval)
+            else:
+                data = ticker.history(start=start, interval=interval)
             if data.empty:
-                self.logger.warning(f"No data found for symbol {symbol} with period {period}.")
-            return data
+                self.logger.warning(f"No data found for symbol {symbol} ({window}).")
+            return _normalize_history(data)
         except Exception as e:
             self.logger.error(f"An error occurred while fetching data for {symbol}: {e}")
             return pd.DataFrame()
 
+    def _download_full_history(
+        self, file_path: str, symbol: str, period: str, interval: str, period_start: pd.Timestamp
+    ) -> pd.DataFrame:
+        """Downloads the whole period for a symbol and replaces its cache file."""
+        data = self._download_history(symbol, period, interval)
+        if not data.empty:
+            self._write_cache(file_path, data, history_start=period_start)
+        return data
+
+    def _get_cache_path(self, symbol: str, interval: str) -> str:
+        """Returns the Parquet cache path for a symbol/interval pair."""
+        assert self.cache_dir is not None
+        return os.path.join(self.cache_dir, f"{symbol.upper()}_{interval}.parquet")
+
+    def _read_cache(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        Loads a cached history file, returning None if it is missing or unreadable.
+        Files written before the columns were normalized are normalized on read.
+        """
+        if not os.path.exists(file_path):
+            return None
+        try:
+            return _normalize_history(pd.read_parquet(file_path, engine='pyarrow'))
+        except Exception as e:
+            self.logger.error(f"Failed to read cache file {file_path}: {e}")
+            return None
+
+    def _read_caches(self, file_paths: List[str]) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Loads many cached history files at once. The reads run on a thread pool so
+        file I/O and Parquet decoding for different symbols overlap.
+        """
+        if len(file_paths) <= 1:
+            return {file_path: self._read_cache(file_path) for file_path in file_paths}
+        workers = min(_CACHE_READ_WORKERS, len(file_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(file_paths, executor.map(self._read_cache, file_paths)))
+
+    def _read_usable_cache(self, file_path: str, period_start: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """
+        Loads a cached history file if it reaches back to the start of the requested period.
+        """
+        cached = self._read_cache(file_path)
+        if cached is None or cached.empty or \
+                not self._cache_covers_period(file_path, cached.index[0], period_start):
+            return None
+        return cached
+
+    def _cache_date_range(self, file_path: str) -> Optional[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Returns the first and last bar timestamps of a cached history file using only
+        the Parquet footer statistics, without reading any rows. Returns None if the
+        file is missing, empty or has no usable statistics.
+        """
+        if not os.path.exists(file_path):
+            return None
+        try:
+            metadata = pq.read_metadata(file_path)
+            schema = metadata.schema.to_arrow_schema()
+            index_name = schema.pandas_metadata['index_columns'][0]
+            column = metadata.schema.names.index(index_name)
+            if metadata.num_rows == 0:
+                return None
+            first = metadata.row_group(0).column(column).statistics
+            last = metadata.row_group(metadata.num_row_groups - 1).column(column).statistics
+            if first is None or last is None or not (first.has_min_max and last.has_min_max):
+                return None
+        except Exception as e:
+            self.logger.error(f"Failed to read cache metadata for {file_path}: {e}")
+            return None
+
+        # Statistics are stored in UTC; convert back to the index's own time zone
+        tz = getattr(schema.field(index_name).type, 'tz', None)
+
+        def to_index_time(value: Any) -> pd.Timestamp:
+            timestamp = pd.Timestamp(value)
+            if tz and timestamp.tzinfo is None:
+                timestamp = timestamp.tz_localize('UTC')
+            return timestamp.tz_convert(tz) if tz else timestamp
+
+        return to_index_time(first.min), to_index_time(last.max)
+
+    def _read_history_start(self, file_path: str) -> Optional[pd.Timestamp]:
+        """
+        Returns the period start recorded when the cache file was last written by a
+        full-period download, or None if it has none.
+        """
+        try:
+            metadata = pq.read_metadata(file_path).metadata or {}
+        except Exception as e:
+            self.logger.error(f"Failed to read cache metadata for {file_path}: {e}")
+            return None
+        value = metadata.get(_HISTORY_START_KEY)
+        return pd.Timestamp(value.decode()) if value else None
+
+    def _cache_covers_period(
+        self, file_path: str, first_bar: pd.Timestamp, period_start: pd.Timestamp
+    ) -> bool:
+        """
+        Whether a cached history starting at `first_bar` reaches back to the start of
+        the requested period. The one-week tolerance covers periods starting on a
+        weekend or holiday. A symbol with less history than the period covers it
+        once a download of at least that period has been cached.
+        """
+        tolerance = pd.Timedelta(days=7)
+        if first_bar.tz_localize(None) <= period_start + tolerance:
+            return True
+        history_start = self._read_history_start(file_path)
+        return history_start is not None and history_start <= period_start + tolerance
+
+    def _append_to_cache(
+        self, file_path: str, cached: pd.DataFrame, new_data: Optional[pd.DataFrame]
+    ) -> Optional[pd.DataFrame]:
+        """
+        Appends freshly downloaded bars to a cached frame and persists the result.
+        Returns None instead if a new bar carries a dividend or split: the cached
+        bars were adjusted before it, so the period has to be downloaded again.
+        """
+        if new_data is None or new_data.empty:
+            return cached
+        new_bars = new_data[new_data.index > cached.index[-1]]
+        if new_bars[['Dividends', 'Stock Splits']].fillna(0).to_numpy().any():
+            self.logger.info(f"New corporate action in {file_path}; the cached history will be refreshed.")
+            return None
+        merged = pd.concat([cached, new_data])
+        merged = merged[~merged.index.duplicated(keep='last')]
+        self._write_cache(file_path, merged, history_start=self._read_history_start(file_path))
+        return merged
+
+    def _write_cache(
+        self, file_path: str, data: pd.DataFrame, history_start: Optional[pd.Timestamp] = None
+    ) -> None:
+        """
+        Writes a history frame to the Parquet cache. `history_start` is the period
+        start of the full download the frame came from, if any.
+        """
+        try:
+            table = pa.Table.from_pandas(data)
+            if history_start is not None:
+                metadata = dict(table.schema.metadata or {})
+                metadata[_HISTORY_START_KEY] = history_start.isoformat().encode()
+                table = table.replace_schema_metadata(metadata)
+            pq.write_table(table, file_path, compression='zstd')
+        except Exception as e:
+            self.logger.error(f"Failed to write cache file {file_path}: {e}")
+
+    @staticmethod
+    def _is_cache_current(file_path: str, last_cached_date: date) -> bool:
+        """
+        A cache file is current if it was already updated today and holds at least
+        the previous business day's bar.
+        """
+        modified = datetime.fromtimestamp(os.path.getmtime(file_path)).date()
+        previous_business_day = (pd.Timestamp.today().normalize() - BDay(1)).date()
+        return modified == date.today() and last_cached_date >= previous_business_day
+
     async def get_ticker_info(self, ticker: str) -> Optional[Dict[str, Any]]:
         """
         Asynchronously fetches ticker information.
@@ -7,9 +7,10 @@ This script initializes the connection to Interactive Brokers, manages data,
 runs the selected trading strategy, and executes paper trades.
 """
 
+import asyncio
 import time
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
 
 from ibapi.contract import Contract
 from ibapi.order import Order
@@ -27,6 +28,7 @@ from strategies.percent_b_strategy import check_percent_b_conditions
 from strategies.mdd_mdu import check_mdd_mdu_conditions
 from strategies.rsi_10_6_90_94 import check_rsi_10_6_90_94_conditions
 from strategies.tps_strategy import check_tps_conditions
+from strategies import three_day_hl, rsi_25_75, r3_strategy, percent_b_strategy, mdd_mdu, rsi_10_6_90_94, tps_strategy
 
 
 # --- Configure Logging ---
@@ -34,14 +36,15 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 
 # --- Strategy Mapping ---
+# "columns" lists every column each strategy reads, taken from the strategy module
 STRATEGY_MAP = {
-    "3_day_hl": check_three_day_hl_conditions,
-    "rsi_25_75": check_rsi_25_75_conditions,
-    "r3": check_r3_conditions,
-    "percent_b": check_percent_b_conditions,
-    "mdd_mdu": check_mdd_mdu_conditions,
-    "rsi_10_6_90_94": check_rsi_10_6_90_94_conditions,
-    "tps": check_tps_conditions,
+    "3_day_hl": {"func": check_three_day_hl_conditions, "columns": three_day_hl._REQUIRED_COLUMNS},
+    "rsi_25_75": {"func": check_rsi_25_75_conditions, "columns": rsi_25_75._REQUIRED_COLUMNS},
+    "r3": {"func": check_r3_conditions, "columns": r3_strategy._REQUIRED_COLUMNS},
+    "percent_b": {"func": check_percent_b_conditions, "columns": percent_b_strategy._REQUIRED_COLUMNS},
+    "mdd_mdu": {"func": check_mdd_mdu_conditions, "columns": mdd_mdu._REQUIRED_COLUMNS},
+    "rsi_10_6_90_94": {"func": check_rsi_10_6_90_94_conditions, "columns": rsi_10_6_90_94._REQUIRED_COLUMNS},
+    "tps": {"func": check_tps_conditions, "columns": tps_strategy._REQUIRED_COLUMNS},
 }
 
 class TradingApp:
@@ -51,9 +54,11 @@ class TradingApp:
     def __init__(self, symbols: list[str], strategy_name: str):
         self.symbols = symbols
         self.strategy_name = strategy_name
-        self.strategy_func = STRATEGY_MAP.get(strategy_name)
-        if not self.strategy_func:
+        strategy_info = STRATEGY_MAP.get(strategy_name)
+        if not strategy_info:
             raise ValueError(f"Strategy '{strategy_name}' not found.")
+        self.strategy_func = strategy_info["func"]
+        self.required_columns = sorted(strategy_info["columns"])
 
         self.ibkr_wrapper = IbkrApiWrapper()
         self.data_manager = DataManager()
@@ -73,32 +78,44 @@ class TradingApp:
         time.sleep(2)
 
         try:
-            while True:
-                for symbol in self.symbols:
-                    self.process_symbol(symbol)
-                # Wait for the next market data update (e.g., every 5 minutes)
-                logging.info("Waiting for next cycle...")
-                time.sleep(300)
+            asyncio.run(self.run_cycles())
         except KeyboardInterrupt:
             logging.info("Application stopped by user.")
         finally:
             self.ibkr_wrapper.disconnect()
             logging.info("Disconnected from IBKR and shut down.")
 
-    def process_symbol(self, symbol: str):
+    async def run_cycles(self):
+        """
+        Processes every symbol concurrently once per cycle, then waits for the next one.
+        """
+        while True:
+            await asyncio.gather(*(self.process_symbol(symbol) for symbol in self.symbols))
+            # Wait for the next market data update (e.g., every 5 minutes)
+            logging.info("Waiting for next cycle...")
+            await asyncio.sleep(300)
+
+    async def process_symbol(self, symbol: str):
         """
         Processes a single symbol: fetches data, checks strategy, and places orders.
+        The blocking data fetch runs in a worker thread so symbols overlap.
         """
         logging.info(f"Processing symbol: {symbol}")
 
         # 1. Fetch and prepare data
-        historical_data = self.data_manager.get_historical_data(symbol)
+        historical_data = await asyncio.to_thread(self.data_manager.get_historical_data, symbol)
         if historical_data.empty:
             logging.warning(f"Could not retrieve historical data for {symbol}.")
             return
 
+        if historical_data.shape[0] < 200:
+            logging.warning(f"Insufficient data for {symbol} (need 200 days).")
+            return
+
         data_with_indicators = calculate_indicators(historical_data)
-        if data_with_indicators.empty or data_with_indicators.isnull().values.any():
+        # Only the latest bar's inputs to this strategy need to be defined; the
+        # indicator warm-up rows at the start of the history are always NaN.
+        if data_with_indicators[self.required_columns].iloc[-1].isna().any():
             logging.warning(f"Could not calculate indicators for {symbol}. Check data integrity.")
             return
 
@@ -117,7 +134,7 @@ class TradingApp:
         self.act_on_signals(symbol, signals)
 
 
-    def act_on_signals(self, symbol: str, signals: Dict[str, Any]):
+    def act_on_signals(self, symbol: str, signals: NamedTuple):
         """
         Interprets the signals from a strategy and places orders if necessary.
         """
@@ -125,11 +142,11 @@ class TradingApp:
         # more sophisticated state management and order handling.
         
         # Example for a simple strategy (e.g., 3_day_hl)
-        if signals.get("long_signal") and not self.position_states[symbol]["is_open"]:
+        if getattr(signals, "long_signal", False) and not self.position_states[symbol]["is_open"]:
             self.place_order(symbol, "BUY", 100) # Example quantity
             self.position_states[symbol].update({"is_open": True, "side": "long"})
         
-        elif signals.get("short_signal") and not self.position_states[symbol]["is_open"]:
+        elif getattr(signals, "short_signal", False) and not self.position_states[symbol]["is_open"]:
             self.place_order(symbol, "SELL", 100) # Example quantity
             self.position_states[symbol].update({"is_open": True, "side": "short"})
 
@@ -0,0 +1,119 @@
+# strategies/fused.py
+
+"""
+Evaluates all seven strategies on one DataFrame in a single pass.
+
+Each strategy's `check_*_conditions` function reads the tails of its columns as
+NumPy arrays on every call. When every strategy is checked for the same bar, as
+in a backtest or a full scan, `check_all` materializes each column once and
+hands the shared arrays to every strategy's rules. When every column is present,
+the six stateless strategies run inside a single compiled kernel.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from strategies import three_day_hl, rsi_25_75, r3_strategy, percent_b_strategy, mdd_mdu, rsi_10_6_90_94
+from strategies.three_day_hl import _three_day_hl_kernel, _three_day_hl_signals
+from strategies.rsi_25_75 import _rsi_25_75_kernel, _rsi_25_75_signals
+from strategies.r3_strategy import _r3_kernel, _r3_signals
+from strategies.percent_b_strategy import _percent_b_kernel, _percent_b_signals
+from strategies.mdd_mdu import _mdd_mdu_kernel, _mdd_mdu_signals
+from strategies.rsi_10_6_90_94 import _rsi_10_6_90_94_kernel, _rsi_10_6_90_94_signals
+from strategies.tps_strategy import _tps_signals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+# Every column read by at least one strategy
+FUSED_COLUMNS = frozenset({'High', 'Low', 'Close', 'SMA_200', 'SMA_5', 'RSI_2', 'RSI_4', '%b'})
+
+# Argument order of _fused_kernel, and the longest lookback any strategy needs (MDD/MDU)
+_KERNEL_COLUMNS = ('High', 'Low', 'Close', 'SMA_200', 'SMA_5', 'RSI_2', 'RSI_4', '%b')
+_TAIL_LENGTH = 6
+
+_THREE_DAY_HL_NO_DATA = three_day_hl._NO_DATA
+_R3_NO_DATA = r3_strategy._NO_DATA
+_PERCENT_B_NO_DATA = percent_b_strategy._NO_DATA
+_MDD_MDU_NO_DATA = mdd_mdu._NO_DATA
+
+# Compiled eagerly for float64 tails, so the first call pays no JIT warm-up
+@njit('UniTuple(i8, 6)(f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:], f8[:])', cache=True)
+def _fused_kernel(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, sma_200: np.ndarray,
+    sma_5: np.ndarray, rsi_2: np.ndarray, rsi_4: np.ndarray, percent_b: np.ndarray
+) -> Tuple[int, int, int, int, int, int]:
+    """
+    Evaluates the six stateless strategies on the last (up to six) rows of every column.
+    Returns each strategy's signal bits, in the order of check_all's result.
+    """
+    n = len(close)
+    close_last = close[-1]
+    sma_200_last = sma_200[-1]
+    sma_5_last = sma_5[-1]
+
+    if n >= 4:
+        three_day_hl_flags = _three_day_hl_kernel(high[-4:], low[-4:], close_last, sma_200_last, sma_5_last)
+        r3_flags = _r3_kernel(close_last, sma_200_last, rsi_2[-3:])
+    else:
+        three_day_hl_flags = _THREE_DAY_HL_NO_DATA
+        r3_flags = _R3_NO_DATA
+    percent_b_flags = _percent_b_kernel(close_last, sma_200_last, percent_b[-3:]) if n >= 3 else _PERCENT_B_NO_DATA
+    mdd_mdu_flags = _mdd_mdu_kernel(close[-5:], sma_200_last, sma_5_last) if n >= 6 else _MDD_MDU_NO_DATA
+
+    return (
+        three_day_hl_flags,
+        _rsi_25_75_kernel(close_last, sma_200_last, rsi_4[-1]),
+        r3_flags,
+        percent_b_flags,
+        mdd_mdu_flags,
+        _rsi_10_6_90_94_kernel(close_last, sma_200_last, sma_5_last, rsi_2[-1]),
+    )
+
+def check_all(
+    data: pd.DataFrame,
+    tps_position_state: Optional[Dict[str, Any]] = None
+) -> Dict[str, NamedTuple]:
+    """
+    Checks the conditions of every strategy on the same data.
+
+    Args:
+        data (pd.DataFrame): A DataFrame with historical price data and the indicator
+                             columns produced by `calculate_indicators`. A Polars
+                             DataFrame with the same columns works as well.
+        tps_position_state (Optional[Dict[str, Any]]): The position state passed to the
+                             TPS strategy. Defaults to no open position.
+
+    Returns:
+        Dict[str, NamedTuple]: The signals of each strategy (see strategies/signals.py),
+                               keyed by the strategy names used in daily_scanner.STRATEGY_MAP.
+    """
+    if tps_position_state is None:
+        tps_position_state = {'is_open': False, 'side': None, 'tranches_filled': 0, 'last_entry_price': 0.0}
+
+    columns = tail_arrays(data, FUSED_COLUMNS, _TAIL_LENGTH)
+
+    if len(columns) == len(FUSED_COLUMNS) and len(data) > 0:
+        # np.array copies each short tail, which also makes it writable: pandas hands
+        # out read-only views, and those do not match the kernel's declared signature.
+        flags = _fused_kernel(*(np.array(columns[col], dtype=np.float64) for col in _KERNEL_COLUMNS))
+        return {
+            "3_day_hl": three_day_hl._SIGNALS_TABLE[flags[0]],
+            "rsi_25_75": rsi_25_75._SIGNALS_TABLE[flags[1]],
+            "r3": r3_strategy._SIGNALS_TABLE[flags[2]],
+            "percent_b": percent_b_strategy._SIGNALS_TABLE[flags[3]],
+            "mdd_mdu": mdd_mdu._SIGNALS_TABLE[flags[4]],
+            "rsi_10_6_90_94": rsi_10_6_90_94._SIGNALS_TABLE[flags[5]],
+            "tps": _tps_signals(columns, tps_position_state),
+        }
+
+    # Some columns are missing: each strategy reports on its own inputs
+    return {
+        "3_day_hl": _three_day_hl_signals(columns),
+        "rsi_25_75": _rsi_25_75_signals(columns),
+        "r3": _r3_signals(columns),
+        "percent_b": _percent_b_signals(columns),
+        "mdd_mdu": _mdd_mdu_signals(columns),
+        "rsi_10_6_90_94": _rsi_10_6_90_94_signals(columns),
+        "tps": _tps_signals(columns, tps_position_state),
+    }
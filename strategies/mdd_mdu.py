@@ -5,10 +5,101 @@ Implements the Multiple Days Down (MDD) & Multiple Days Up (MDU) trading strateg
 from the book "High Probability ETF Trading" by Larry Connors and Cesar Alvarez.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict
+
+from strategies.signals import Signals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+_REQUIRED_COLUMNS = frozenset({'Close', 'SMA_200', 'SMA_5'})
+# The number of rows the rules look back over
+_MIN_ROWS = 6
+
+# Signal bits returned by the compiled kernel
+_LONG_ENTRY, _LONG_EXIT, _SHORT_ENTRY, _SHORT_EXIT, _NO_DATA = 1, 2, 4, 8, 16
+
+def _describe(flags: int) -> str:
+    """Builds the status message for a combination of signal bits."""
+    if flags & _NO_DATA:
+        return "Insufficient data or missing columns"
+    status = "No signal"
+    if flags & _LONG_ENTRY:
+        status = "Long entry signal detected (MDD)"
+    if flags & _LONG_EXIT and status == "No signal":
+        status = "Long exit signal detected"
+    if flags & _SHORT_ENTRY:
+        status = "Short entry signal detected (MDU)"
+    if flags & _SHORT_EXIT and status == "No signal":
+        status = "Short exit signal detected"
+    return status
+
+# Every status message, indexed by signal bits, so no strings are built per call
+_STATUS_TABLE = tuple(_describe(flags) for flags in range(2 * _NO_DATA))
+
+@njit(cache=True)
+def _mdd_mdu_kernel(closes: np.ndarray, sma_200_last: float, sma_5_last: float) -> int:
+    """
+    Evaluates the MDD/MDU rules on the last five closes.
+    Returns the signal bits that are set.
+    """
+    close_last = closes[-1]
+
+    # The long and short entries need opposite trends, so only the side the trend
+    # allows is evaluated; with a NaN SMA neither side can enter.
+    long_entry = False
+    short_entry = False
+    if close_last > sma_200_last:
+        # --- Long Side Conditions (MDD) ---
+        # Entry: at least 4 down closes in the last 5 days, in an uptrend and below the 5-day SMA
+        down_days = 0
+        for i in range(1, len(closes)):
+            down_days += closes[i] - closes[i - 1] < 0
+        long_entry = close_last < sma_5_last and down_days >= 4
+    elif close_last < sma_200_last:
+        # --- Short Side Conditions (MDU) ---
+        # Entry: at least 4 up closes in the last 5 days, in a downtrend and above the 5-day SMA
+        up_days = 0
+        for i in range(1, len(closes)):
+            up_days += closes[i] - closes[i - 1] > 0
+        short_entry = close_last > sma_5_last and up_days >= 4
+
+    # Exits do not depend on the trend
+    # Long exit: Close above the 5-day SMA
+    long_exit = close_last > sma_5_last
+    # Short exit: Close below the 5-day SMA
+    short_exit = close_last < sma_5_last
+
+    return (long_entry * _LONG_ENTRY) | (long_exit * _LONG_EXIT) | \
+        (short_entry * _SHORT_ENTRY) | (short_exit * _SHORT_EXIT)
+
+def _signals_from_flags(flags: int) -> Signals:
+    """Unpacks the signal bits from the kernel into the result tuple."""
+    return Signals(
+        bool(flags & _LONG_ENTRY), bool(flags & _LONG_EXIT),
+        bool(flags & _SHORT_ENTRY), bool(flags & _SHORT_EXIT),
+        _STATUS_TABLE[flags]
+    )
+
+# Result tuples are immutable, so one instance per combination of bits is shared
+_SIGNALS_TABLE = tuple(_signals_from_flags(flags) for flags in range(2 * _NO_DATA))
+
+def _mdd_mdu_signals(columns: Dict[str, np.ndarray]) -> Signals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Data validation: Need 5 prior days + current day = 6 rows
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        flags = _NO_DATA
+    else:
+        flags = _mdd_mdu_kernel(columns['Close'][-5:], columns['SMA_200'][-1], columns['SMA_5'][-1])
+
+    return _SIGNALS_TABLE[flags]
 
-def check_mdd_mdu_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
+
+def check_mdd_mdu_conditions(data: pd.DataFrame) -> Signals:
     """
     Checks the conditions for the MDD/MDU trading strategy.
 
@@ -20,66 +111,44 @@ def check_mdd_mdu_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
                              of data to check the 5-day closing trend.
 
     Returns:
-        Dict[str, Union[bool, str]]: A dictionary containing boolean flags for each signal
-                                     and a status message.
-                                     'long_entry': True if long entry conditions are met.
-                                     'long_exit': True if long exit conditions are met.
-                                     'short_entry': True if short entry conditions are met.
-                                     'short_exit': True if short exit conditions are met.
-                                     'status': A message indicating the outcome.
+        Signals: A named tuple of boolean flags for each signal and a status message.
+                 long_entry: True if long entry conditions are met.
+                 long_exit: True if long exit conditions are met.
+                 short_entry: True if short entry conditions are met.
+                 short_exit: True if short exit conditions are met.
+                 status: A message indicating the outcome.
     """
-    # Initialize default return values
-    signals = {
-        "long_entry": False, "long_exit": False,
-        "short_entry": False, "short_exit": False,
-        "status": "No signal"
-    }
+    return _mdd_mdu_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS))
 
-    # Data validation: Need 5 prior days + current day = 6 rows
-    required_columns = ['Close', 'SMA_200', 'SMA_5']
-    if len(data) < 6 or not all(col in data.columns for col in required_columns):
-        signals["status"] = "Insufficient data or missing columns"
-        return signals
-
-    # Get the most recent data point
-    latest = data.iloc[-1]
-
-    # --- Long Side Conditions (MDD) ---
-    is_uptrend = latest['Close'] > latest['SMA_200']
-    is_below_sma5 = latest['Close'] < latest['SMA_5']
-
-    # Entry: Check for at least 4 down closes in the last 5 days
-    if is_uptrend and is_below_sma5:
-        # Calculate daily changes for the last 5 periods
-        closes_last_5_days = data['Close'].iloc[-5:]
-        down_days = (closes_last_5_days.diff().dropna() < 0).sum()
-        if down_days >= 4:
-            signals["long_entry"] = True
-            signals["status"] = "Long entry signal detected (MDD)"
-
-    # Exit: Close above the 5-day SMA
-    if latest['Close'] > latest['SMA_5']:
-        signals["long_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Long exit signal detected"
-
-
-    # --- Short Side Conditions (MDU) ---
-    is_downtrend = latest['Close'] < latest['SMA_200']
-    is_above_sma5 = latest['Close'] > latest['SMA_5']
-
-    # Entry: Check for at least 4 up closes in the last 5 days
-    if is_downtrend and is_above_sma5:
-        closes_last_5_days = data['Close'].iloc[-5:]
-        up_days = (closes_last_5_days.diff().dropna() > 0).sum()
-        if up_days >= 4:
-            signals["short_entry"] = True
-            signals["status"] = "Short entry signal detected (MDU)"
-
-    # Exit: Close below the 5-day SMA
-    if latest['Close'] < latest['SMA_5']:
-        signals["short_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Short exit signal detected"
-
-    return signals
+
+def compute_mdd_mdu_signals(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the MDD/MDU signals for every bar of a history in one vectorized pass.
+
+    Row t holds the flags `check_mdd_mdu_conditions` would return for `data.iloc[:t + 1]`,
+    so a backtest can evaluate a whole history at once instead of bar by bar.
+
+    Args:
+        data (pd.DataFrame): A DataFrame with 'Close', 'SMA_200' and 'SMA_5' columns.
+
+    Returns:
+        pd.DataFrame: Boolean 'long_entry', 'long_exit', 'short_entry' and 'short_exit'
+                      columns on the same index as `data`.
+    """
+    columns = ["long_entry", "long_exit", "short_entry", "short_exit"]
+    if not _REQUIRED_COLUMNS.issubset(data.columns):
+        return pd.DataFrame(False, index=data.index, columns=columns)
+
+    close, sma_200, sma_5 = data['Close'], data['SMA_200'], data['SMA_5']
+    # Need 5 prior days + current day = 6 rows
+    has_history = np.arange(len(data)) >= 5
+    change = close.diff()
+    down_days = (change < 0).astype(int).rolling(4).sum()
+    up_days = (change > 0).astype(int).rolling(4).sum()
+
+    return pd.DataFrame({
+        "long_entry": (close > sma_200) & (close < sma_5) & (down_days >= 4) & has_history,
+        "long_exit": (close > sma_5) & has_history,
+        "short_entry": (close < sma_200) & (close > sma_5) & (up_days >= 4) & has_history,
+        "short_exit": (close < sma_5) & has_history,
+    }, index=data.index)
@@ -5,10 +5,88 @@ Implements the %b trading strategy from the book "High Probability ETF Trading"
 by Larry Connors and Cesar Alvarez.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict
 
-def check_percent_b_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
+from strategies.signals import Signals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+_REQUIRED_COLUMNS = frozenset({'Close', 'SMA_200', '%b'})
+# The number of rows the rules look back over
+_MIN_ROWS = 3
+
+# Signal bits returned by the compiled kernel
+_LONG_ENTRY, _LONG_EXIT, _SHORT_ENTRY, _SHORT_EXIT, _NO_DATA = 1, 2, 4, 8, 16
+
+def _describe(flags: int) -> str:
+    """Builds the status message for a combination of signal bits."""
+    if flags & _NO_DATA:
+        return "Insufficient data or missing columns"
+    status = "No signal"
+    if flags & _LONG_ENTRY:
+        status = "Long entry signal detected"
+    if flags & _LONG_EXIT and status == "No signal":
+        status = "Long exit signal detected"
+    if flags & _SHORT_ENTRY:
+        status = "Short entry signal detected"
+    if flags & _SHORT_EXIT and status == "No signal":
+        status = "Short exit signal detected"
+    return status
+
+_STATUS_TABLE = tuple(_describe(flags) for flags in range(2 * _NO_DATA))
+
+@njit(cache=True)
+def _percent_b_kernel(close_last: float, sma_200_last: float, percent_b: np.ndarray) -> int:
+    """
+    Evaluates the %b rules on the last three %b values.
+    Returns the signal bits that are set.
+    """
+    long_entry = False
+    short_entry = False
+    if close_last > sma_200_last:
+        # --- Long Side Conditions ---
+        # Entry: %b has been below 0.2 for three consecutive days in an uptrend.
+        long_entry = percent_b[-1] < 0.2 and percent_b[-2] < 0.2 and percent_b[-3] < 0.2
+    elif close_last < sma_200_last:
+        # --- Short Side Conditions ---
+        # Entry: %b has been above 0.8 for three consecutive days in a downtrend.
+        short_entry = percent_b[-1] > 0.8 and percent_b[-2] > 0.8 and percent_b[-3] > 0.8
+
+    # Long exit: %b closes above 0.8.
+    long_exit = percent_b[-1] > 0.8
+    # Short exit: %b closes below 0.2.
+    short_exit = percent_b[-1] < 0.2
+
+    return (long_entry * _LONG_ENTRY) | (long_exit * _LONG_EXIT) | \
+        (short_entry * _SHORT_ENTRY) | (short_exit * _SHORT_EXIT)
+
+def _signals_from_flags(flags: int) -> Signals:
+    """Unpacks the signal bits from the kernel into the result tuple."""
+    return Signals(
+        bool(flags & _LONG_ENTRY), bool(flags & _LONG_EXIT),
+        bool(flags & _SHORT_ENTRY), bool(flags & _SHORT_EXIT),
+        _STATUS_TABLE[flags]
+    )
+
+_SIGNALS_TABLE = tuple(_signals_from_flags(flags) for flags in range(2 * _NO_DATA))
+
+def _percent_b_signals(columns: Dict[str, np.ndarray]) -> Signals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Ensure there is enough data and the required columns
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        flags = _NO_DATA
+    else:
+        flags = _percent_b_kernel(columns['Close'][-1], columns['SMA_200'][-1], columns['%b'][-3:])
+
+    return _SIGNALS_TABLE[flags]
+
+
+def check_percent_b_conditions(data: pd.DataFrame) -> Signals:
     """
     Checks the conditions for the %b trading strategy.
 
@@ -21,60 +99,42 @@ def check_percent_b_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]
                              of data to check the 3-day %b trend.
 
     Returns:
-        Dict[str, Union[bool, str]]: A dictionary containing boolean flags for each signal
-                                     and a status message.
-                                     'long_entry': True if long entry conditions are met.
-                                     'long_exit': True if long exit conditions are met.
-                                     'short_entry': True if short entry conditions are met.
-                                     'short_exit': True if short exit conditions are met.
-                                     'status': A message indicating the outcome.
+        Signals: A named tuple of boolean flags for each signal and a status message.
+                 long_entry: True if long entry conditions are met.
+                 long_exit: True if long exit conditions are met.
+                 short_entry: True if short entry conditions are met.
+                 short_exit: True if short exit conditions are met.
+                 status: A message indicating the outcome.
+    """
+    return _percent_b_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS))
+
+
+def compute_percent_b_signals(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the %b signals for every bar of a history in one vectorized pass.
+
+    Row t holds the flags `check_percent_b_conditions` would return for `data.iloc[:t + 1]`,
+    so a backtest can evaluate a whole history at once instead of bar by bar.
+
+    Args:
+        data (pd.DataFrame): A DataFrame with 'Close', 'SMA_200' and '%b' columns.
+
+    Returns:
+        pd.DataFrame: Boolean 'long_entry', 'long_exit', 'short_entry' and 'short_exit'
+                      columns on the same index as `data`.
     """
-    # Initialize default return values
-    signals = {
-        "long_entry": False, "long_exit": False,
-        "short_entry": False, "short_exit": False,
-        "status": "No signal"
-    }
-
-    # Ensure the DataFrame has enough data and the required columns
-    required_columns = ['Close', 'SMA_200', '%b']
-    if len(data) < 3 or not all(col in data.columns for col in required_columns):
-        signals["status"] = "Insufficient data or missing columns"
-        return signals
-
-    # Get the most recent three data points for %b trend analysis
-    latest = data.iloc[-1]
-    prev_1 = data.iloc[-2]
-    prev_2 = data.iloc[-3]
-
-    # --- Long Side Conditions ---
-    is_uptrend = latest['Close'] > latest['SMA_200']
-
-    # Entry: %b has been below 0.2 for three consecutive days in an uptrend.
-    b_below_threshold_3_days = latest['%b'] < 0.2 and prev_1['%b'] < 0.2 and prev_2['%b'] < 0.2
-    if is_uptrend and b_below_threshold_3_days:
-        signals["long_entry"] = True
-        signals["status"] = "Long entry signal detected"
-
-    # Exit: %b closes above 0.8.
-    if latest['%b'] > 0.8:
-        signals["long_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Long exit signal detected"
-
-    # --- Short Side Conditions ---
-    is_downtrend = latest['Close'] < latest['SMA_200']
-
-    # Entry: %b has been above 0.8 for three consecutive days in a downtrend.
-    b_above_threshold_3_days = latest['%b'] > 0.8 and prev_1['%b'] > 0.8 and prev_2['%b'] > 0.8
-    if is_downtrend and b_above_threshold_3_days:
-        signals["short_entry"] = True
-        signals["status"] = "Short entry signal detected"
-
-    # Exit: %b closes below 0.2.
-    if latest['%b'] < 0.2:
-        signals["short_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Short exit signal detected"
-
-    return signals
+    columns = ["long_entry", "long_exit", "short_entry", "short_exit"]
+    if not _REQUIRED_COLUMNS.issubset(data.columns):
+        return pd.DataFrame(False, index=data.index, columns=columns)
+
+    close, sma_200, percent_b = data['Close'], data['SMA_200'], data['%b']
+    has_history = np.arange(len(data)) >= 2
+    b_below_threshold_3_days = (percent_b < 0.2) & (percent_b.shift(1) < 0.2) & (percent_b.shift(2) < 0.2)
+    b_above_threshold_3_days = (percent_b > 0.8) & (percent_b.shift(1) > 0.8) & (percent_b.shift(2) > 0.8)
+
+    return pd.DataFrame({
+        "long_entry": (close > sma_200) & b_below_threshold_3_days & has_history,
+        "long_exit": (percent_b > 0.8) & has_history,
+        "short_entry": (close < sma_200) & b_above_threshold_3_days & has_history,
+        "short_exit": (percent_b < 0.2) & has_history,
+    }, index=data.index)
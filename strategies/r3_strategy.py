@@ -5,10 +5,94 @@ Implements the R3 trading strategy from the book "High Probability ETF Trading"
 by Larry Connors and Cesar Alvarez.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict
+
+from strategies.signals import Signals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+_REQUIRED_COLUMNS = frozenset({'Close', 'SMA_200', 'RSI_2'})
+# The number of rows the rules look back over
+_MIN_ROWS = 4
+
+# Signal bits returned by the compiled kernel
+_LONG_ENTRY, _LONG_EXIT, _SHORT_ENTRY, _SHORT_EXIT, _NO_DATA = 1, 2, 4, 8, 16
+
+def _describe(flags: int) -> str:
+    """Builds the status message for a combination of signal bits."""
+    if flags & _NO_DATA:
+        return "Insufficient data or missing columns"
+    status = "No signal"
+    if flags & _LONG_ENTRY:
+        status = "Long entry signal detected"
+    if flags & _LONG_EXIT and status == "No signal":
+        status = "Long exit signal detected"
+    if flags & _SHORT_ENTRY:
+        status = "Short entry signal detected"
+    if flags & _SHORT_EXIT and status == "No signal":
+        status = "Short exit signal detected"
+    return status
+
+_STATUS_TABLE = tuple(_describe(flags) for flags in range(2 * _NO_DATA))
+
+@njit(cache=True)
+def _r3_kernel(close_last: float, sma_200_last: float, rsi_2: np.ndarray) -> int:
+    """
+    Evaluates the R3 rules on the last three 2-period RSI values.
+    Returns the signal bits that are set.
+    """
+    long_entry = False
+    short_entry = False
+    if close_last > sma_200_last:
+        # --- Long Side Conditions ---
+        # Entry: 3-day RSI drop from below 60, ending below 10
+        rsi_dropped_3_days = rsi_2[-1] < rsi_2[-2] and rsi_2[-2] < rsi_2[-3]
+        rsi_start_was_low = rsi_2[-3] < 60 # Check RSI on the first day of the 3-day period
+        rsi_is_oversold = rsi_2[-1] < 10
+        long_entry = rsi_dropped_3_days and rsi_start_was_low and rsi_is_oversold
+    elif close_last < sma_200_last:
+        # --- Short Side Conditions ---
+        # Entry: 3-day RSI rise from above 40, ending above 90
+        rsi_rose_3_days = rsi_2[-1] > rsi_2[-2] and rsi_2[-2] > rsi_2[-3]
+        rsi_start_was_high = rsi_2[-3] > 40 # Check RSI on the first day of the 3-day period
+        rsi_is_overbought = rsi_2[-1] > 90
+        short_entry = rsi_rose_3_days and rsi_start_was_high and rsi_is_overbought
+
+    # Long exit: 2-period RSI closes above 70
+    long_exit = rsi_2[-1] > 70
+    # Short exit: 2-period RSI closes below 30
+    short_exit = rsi_2[-1] < 30
+
+    return (long_entry * _LONG_ENTRY) | (long_exit * _LONG_EXIT) | \
+        (short_entry * _SHORT_ENTRY) | (short_exit * _SHORT_EXIT)
+
+def _signals_from_flags(flags: int) -> Signals:
+    """Unpacks the signal bits from the kernel into the result tuple."""
+    return Signals(
+        bool(flags & _LONG_ENTRY), bool(flags & _LONG_EXIT),
+        bool(flags & _SHORT_ENTRY), bool(flags & _SHORT_EXIT),
+        _STATUS_TABLE[flags]
+    )
+
+_SIGNALS_TABLE = tuple(_signals_from_flags(flags) for flags in range(2 * _NO_DATA))
+
+def _r3_signals(columns: Dict[str, np.ndarray]) -> Signals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Ensure there is enough data and the required columns
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        flags = _NO_DATA
+    else:
+        flags = _r3_kernel(columns['Close'][-1], columns['SMA_200'][-1], columns['RSI_2'][-3:])
 
-def check_r3_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
+    return _SIGNALS_TABLE[flags]
+
+
+def check_r3_conditions(data: pd.DataFrame) -> Signals:
     """
     Checks the conditions for the R3 trading strategy.
 
@@ -21,68 +105,43 @@ def check_r3_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
                              least 4 rows of data to check the 3-day RSI trend.
 
     Returns:
-        Dict[str, Union[bool, str]]: A dictionary containing boolean flags for each signal
-                                     and a status message.
-                                     'long_entry': True if long entry conditions are met.
-                                     'long_exit': True if long exit conditions are met.
-                                     'short_entry': True if short entry conditions are met.
-                                     'short_exit': True if short exit conditions are met.
-                                     'status': A message indicating the outcome.
+        Signals: A named tuple of boolean flags for each signal and a status message.
+                 long_entry: True if long entry conditions are met.
+                 long_exit: True if long exit conditions are met.
+                 short_entry: True if short entry conditions are met.
+                 short_exit: True if short exit conditions are met.
+                 status: A message indicating the outcome.
+    """
+    return _r3_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS))
+
+
+def compute_r3_signals(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the R3 signals for every bar of a history in one vectorized pass.
+
+    Row t holds the flags `check_r3_conditions` would return for `data.iloc[:t + 1]`,
+    so a backtest can evaluate a whole history at once instead of bar by bar.
+
+    Args:
+        data (pd.DataFrame): A DataFrame with 'Close', 'SMA_200' and 'RSI_2' columns.
+
+    Returns:
+        pd.DataFrame: Boolean 'long_entry', 'long_exit', 'short_entry' and 'short_exit'
+                      columns on the same index as `data`.
     """
-    # Initialize default return values
-    signals = {
-        "long_entry": False, "long_exit": False,
-        "short_entry": False, "short_exit": False,
-        "status": "No signal"
-    }
-
-    # Ensure the DataFrame has enough data and the required columns
-    required_columns = ['Close', 'SMA_200', 'RSI_2']
-    if len(data) < 4 or not all(col in data.columns for col in required_columns):
-        signals["status"] = "Insufficient data or missing columns"
-        return signals
-
-    # Get the most recent four data points for RSI trend analysis
-    latest = data.iloc[-1]
-    prev_1 = data.iloc[-2]
-    prev_2 = data.iloc[-3]
-    prev_3 = data.iloc[-4]
-
-    # --- Long Side Conditions ---
-    is_uptrend = latest['Close'] > latest['SMA_200']
-
-    # Entry: 3-day RSI drop from below 60, ending below 10
-    rsi_dropped_3_days = latest['RSI_2'] < prev_1['RSI_2'] and prev_1['RSI_2'] < prev_2['RSI_2']
-    rsi_start_was_low = prev_2['RSI_2'] < 60 # Check RSI on the first day of the 3-day period
-    rsi_is_oversold = latest['RSI_2'] < 10
-
-    if is_uptrend and rsi_dropped_3_days and rsi_start_was_low and rsi_is_oversold:
-        signals["long_entry"] = True
-        signals["status"] = "Long entry signal detected"
-
-    # Exit: 2-period RSI closes above 70
-    if latest['RSI_2'] > 70:
-        signals["long_exit"] = True
-        # Note: An exit signal can occur independently of an entry signal on a given day.
-        if signals["status"] == "No signal":
-             signals["status"] = "Long exit signal detected"
-
-    # --- Short Side Conditions ---
-    is_downtrend = latest['Close'] < latest['SMA_200']
-
-    # Entry: 3-day RSI rise from above 40, ending above 90
-    rsi_rose_3_days = latest['RSI_2'] > prev_1['RSI_2'] and prev_1['RSI_2'] > prev_2['RSI_2']
-    rsi_start_was_high = prev_2['RSI_2'] > 40 # Check RSI on the first day of the 3-day period
-    rsi_is_overbought = latest['RSI_2'] > 90
-
-    if is_downtrend and rsi_rose_3_days and rsi_start_was_high and rsi_is_overbought:
-        signals["short_entry"] = True
-        signals["status"] = "Short entry signal detected"
-
-    # Exit: 2-period RSI closes below 30
-    if latest['RSI_2'] < 30:
-        signals["short_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Short exit signal detected"
-
-    return signals
+    columns = ["long_entry", "long_exit", "short_entry", "short_exit"]
+    if not _REQUIRED_COLUMNS.issubset(data.columns):
+        return pd.DataFrame(False, index=data.index, columns=columns)
+
+    close, sma_200, rsi_2 = data['Close'], data['SMA_200'], data['RSI_2']
+    rsi_prev_1, rsi_prev_2 = rsi_2.shift(1), rsi_2.shift(2)
+    has_history = np.arange(len(data)) >= 3
+    rsi_dropped_3_days = (rsi_2 < rsi_prev_1) & (rsi_prev_1 < rsi_prev_2)
+    rsi_rose_3_days = (rsi_2 > rsi_prev_1) & (rsi_prev_1 > rsi_prev_2)
+
+    return pd.DataFrame({
+        "long_entry": (close > sma_200) & rsi_dropped_3_days & (rsi_prev_2 < 60) & (rsi_2 < 10) & has_history,
+        "long_exit": (rsi_2 > 70) & has_history,
+        "short_entry": (close < sma_200) & rsi_rose_3_days & (rsi_prev_2 > 40) & (rsi_2 > 90) & has_history,
+        "short_exit": (rsi_2 < 30) & has_history,
+    }, index=data.index)
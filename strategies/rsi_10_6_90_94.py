@@ -5,10 +5,107 @@ Implements the RSI 10/6 & RSI 90/94 trading strategy from the book
 "High Probability ETF Trading" by Larry Connors and Cesar Alvarez.
 """
 
+import functools
+import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict
+
+from strategies.signals import TieredSignals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+_REQUIRED_COLUMNS = frozenset({'Close', 'SMA_200', 'SMA_5', 'RSI_2'})
+# The number of rows the rules look back over
+_MIN_ROWS = 1
+
+# Signal bits returned by the compiled kernel
+(_LONG_INITIAL_ENTRY, _LONG_SECOND_ENTRY, _LONG_EXIT,
+ _SHORT_INITIAL_ENTRY, _SHORT_SECOND_ENTRY, _SHORT_EXIT, _NO_DATA) = 1, 2, 4, 8, 16, 32, 64
+
+def _describe(flags: int) -> str:
+    """Builds the status message for a combination of signal bits."""
+    if flags & _NO_DATA:
+        return "Insufficient data or missing columns"
+    status = "No signal"
+    if flags & _LONG_INITIAL_ENTRY:
+        status = "Long initial entry signal detected"
+    if flags & _LONG_SECOND_ENTRY:
+        status = "Long second entry signal detected"
+    if flags & _LONG_EXIT and status == "No signal":
+        status = "Long exit signal detected"
+    if flags & _SHORT_INITIAL_ENTRY:
+        status = "Short initial entry signal detected"
+    if flags & _SHORT_SECOND_ENTRY:
+        status = "Short second entry signal detected"
+    if flags & _SHORT_EXIT and status == "No signal":
+        status = "Short exit signal detected"
+    return status
+
+_STATUS_TABLE = tuple(_describe(flags) for flags in range(2 * _NO_DATA))
+
+@njit(cache=True)
+def _rsi_10_6_90_94_kernel(
+    close_last: float, sma_200_last: float, sma_5_last: float, rsi_2_last: float
+) -> int:
+    """
+    Evaluates the RSI 10/6 & 90/94 rules on the latest bar.
+    Returns the signal bits that are set.
+    """
+    long_initial_entry = long_second_entry = False
+    short_initial_entry = short_second_entry = False
+    if close_last > sma_200_last:
+        # --- Long Side Conditions (RSI 10/6) ---
+        # Initial Entry: 2-period RSI closes under 10
+        long_initial_entry = rsi_2_last < 10
+        # Second Entry: 2-period RSI closes under 6
+        long_second_entry = rsi_2_last < 6
+    elif close_last < sma_200_last:
+        # --- Short Side Conditions (RSI 90/94) ---
+        # Initial Entry: 2-period RSI closes above 90
+        short_initial_entry = rsi_2_last > 90
+        # Second Entry: 2-period RSI closes above 94
+        short_second_entry = rsi_2_last > 94
+
+    # Exit for Longs: ETF closes above its 5-day SMA
+    long_exit = close_last > sma_5_last
+    # Exit for Shorts: ETF closes below its 5-day SMA
+    short_exit = close_last < sma_5_last
+
+    return (long_initial_entry * _LONG_INITIAL_ENTRY) | (long_second_entry * _LONG_SECOND_ENTRY) | \
+        (long_exit * _LONG_EXIT) | (short_initial_entry * _SHORT_INITIAL_ENTRY) | \
+        (short_second_entry * _SHORT_SECOND_ENTRY) | (short_exit * _SHORT_EXIT)
+
+# Memoized on the four latest-bar inputs, which fully determine the result
+_cached_rsi_10_6_90_94_kernel = functools.lru_cache(maxsize=10_000)(_rsi_10_6_90_94_kernel)
+
+def _signals_from_flags(flags: int) -> TieredSignals:
+    """Unpacks the signal bits from the kernel into the result tuple."""
+    return TieredSignals(
+        bool(flags & _LONG_INITIAL_ENTRY), bool(flags & _LONG_SECOND_ENTRY), bool(flags & _LONG_EXIT),
+        bool(flags & _SHORT_INITIAL_ENTRY), bool(flags & _SHORT_SECOND_ENTRY), bool(flags & _SHORT_EXIT),
+        _STATUS_TABLE[flags]
+    )
 
-def check_rsi_10_6_90_94_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
+_SIGNALS_TABLE = tuple(_signals_from_flags(flags) for flags in range(2 * _NO_DATA))
+
+def _rsi_10_6_90_94_signals(columns: Dict[str, np.ndarray]) -> TieredSignals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Ensure there is enough data and the required columns
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        flags = _NO_DATA
+    else:
+        flags = _cached_rsi_10_6_90_94_kernel(
+            columns['Close'][-1], columns['SMA_200'][-1],
+            columns['SMA_5'][-1], columns['RSI_2'][-1]
+        )
+
+    return _SIGNALS_TABLE[flags]
+
+
+def check_rsi_10_6_90_94_conditions(data: pd.DataFrame) -> TieredSignals:
     """
     Checks the conditions for the RSI 10/6 & RSI 90/94 trading strategy.
 
@@ -20,68 +117,44 @@ def check_rsi_10_6_90_94_conditions(data: pd.DataFrame) -> Dict[str, Union[bool,
                              'SMA_200', 'SMA_5', and 'RSI_2' (2-period RSI).
 
     Returns:
-        Dict[str, Union[bool, str]]: A dictionary containing boolean flags for each
-                                     potential trading signal and a status message.
+        TieredSignals: A named tuple of boolean flags for each potential trading
+                       signal and a status message.
     """
-    # Initialize default return values
-    signals = {
-        "long_initial_entry": False,
-        "long_second_entry": False,
-        "long_exit": False,
-        "short_initial_entry": False,
-        "short_second_entry": False,
-        "short_exit": False,
-        "status": "No signal"
-    }
-
-    # Ensure the DataFrame has enough data and the required columns
-    required_columns = ['Close', 'SMA_200', 'SMA_5', 'RSI_2']
-    if len(data) < 1 or not all(col in data.columns for col in required_columns):
-        signals["status"] = "Insufficient data or missing columns"
-        return signals
-
-    # Get the most recent data point
-    latest = data.iloc[-1]
-
-    # --- Long Side Conditions (RSI 10/6) ---
-    is_uptrend = latest['Close'] > latest['SMA_200']
-
-    if is_uptrend:
-        # Initial Entry: 2-period RSI closes under 10
-        if latest['RSI_2'] < 10:
-            signals["long_initial_entry"] = True
-            signals["status"] = "Long initial entry signal detected"
-
-        # Second Entry: 2-period RSI closes under 6
-        if latest['RSI_2'] < 6:
-            signals["long_second_entry"] = True
-            signals["status"] = "Long second entry signal detected"
-
-    # Exit for Longs: ETF closes above its 5-day SMA
-    if latest['Close'] > latest['SMA_5']:
-        signals["long_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Long exit signal detected"
-
+    return _rsi_10_6_90_94_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS))
 
-    # --- Short Side Conditions (RSI 90/94) ---
-    is_downtrend = latest['Close'] < latest['SMA_200']
 
-    if is_downtrend:
-        # Initial Entry: 2-period RSI closes above 90
-        if latest['RSI_2'] > 90:
-            signals["short_initial_entry"] = True
-            signals["status"] = "Short initial entry signal detected"
+def compute_rsi_10_6_90_94_signals(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the RSI 10/6 & 90/94 signals for every bar of a history in one vectorized pass.
 
-        # Second Entry: 2-period RSI closes above 94
-        if latest['RSI_2'] > 94:
-            signals["short_second_entry"] = True
-            signals["status"] = "Short second entry signal detected"
+    Row t holds the flags `check_rsi_10_6_90_94_conditions` would return for
+    `data.iloc[:t + 1]`, so a backtest can evaluate a whole history at once instead
+    of bar by bar.
 
-    # Exit for Shorts: ETF closes below its 5-day SMA
-    if latest['Close'] < latest['SMA_5']:
-        signals["short_exit"] = True
-        if signals["status"] == "No signal":
-            signals["status"] = "Short exit signal detected"
+    Args:
+        data (pd.DataFrame): A DataFrame with 'Close', 'SMA_200', 'SMA_5' and 'RSI_2' columns.
 
-    return signals
+    Returns:
+        pd.DataFrame: Boolean 'long_initial_entry', 'long_second_entry', 'long_exit',
+                      'short_initial_entry', 'short_second_entry' and 'short_exit'
+                      columns on the same index as `data`.
+    """
+    columns = [
+        "long_initial_entry", "long_second_entry", "long_exit",
+        "short_initial_entry", "short_second_entry", "short_exit"
+    ]
+    if not _REQUIRED_COLUMNS.issubset(data.columns):
+        return pd.DataFrame(False, index=data.index, columns=columns)
+
+    close, sma_200, sma_5, rsi_2 = data['Close'], data['SMA_200'], data['SMA_5'], data['RSI_2']
+    is_uptrend = close > sma_200
+    is_downtrend = close < sma_200
+
+    return pd.DataFrame({
+        "long_initial_entry": is_uptrend & (rsi_2 < 10),
+        "long_second_entry": is_uptrend & (rsi_2 < 6),
+        "long_exit": close > sma_5,
+        "short_initial_entry": is_downtrend & (rsi_2 > 90),
+        "short_second_entry": is_downtrend & (rsi_2 > 94),
+        "short_exit": close < sma_5,
+    }, index=data.index)
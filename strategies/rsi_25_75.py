@@ -5,10 +5,84 @@ Implements the RSI 25 & RSI 75 trading strategy from the book "High Probability
 by Larry Connors and Cesar Alvarez.
 """
 
+import functools
+import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict
 
-def check_rsi_25_75_conditions(data: pd.DataFrame) -> Dict[str, bool]:
+from strategies.signals import AggressiveSignals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+_REQUIRED_COLUMNS = frozenset({'Close', 'SMA_200', 'RSI_4'})
+# The number of rows the rules look back over
+_MIN_ROWS = 1
+
+# Signal bits returned by the compiled kernel
+(_LONG_ENTRY, _LONG_AGGRESSIVE_ENTRY, _LONG_EXIT,
+ _SHORT_ENTRY, _SHORT_AGGRESSIVE_ENTRY, _SHORT_EXIT, _NO_DATA) = 1, 2, 4, 8, 16, 32, 64
+
+@njit(cache=True)
+def _rsi_25_75_kernel(
+    close_last: float, sma_200_last: float, rsi_4_last: float
+) -> int:
+    """
+    Evaluates the RSI 25/75 rules on the latest bar.
+    Returns the signal bits that are set.
+    """
+    long_entry = long_aggressive_entry = False
+    short_entry = short_aggressive_entry = False
+    if close_last > sma_200_last:
+        # --- Long Side Conditions ---
+        # Initial Long Entry: RSI(4) closes under 25 in an uptrend.
+        long_entry = rsi_4_last < 25
+        # Aggressive Long Entry: RSI(4) closes under 20 in an uptrend.
+        long_aggressive_entry = rsi_4_last < 20
+    elif close_last < sma_200_last:
+        # --- Short Side Conditions ---
+        # Initial Short Entry: RSI(4) closes above 75 in a downtrend.
+        short_entry = rsi_4_last > 75
+        # Aggressive Short Entry: RSI(4) closes above 80 in a downtrend.
+        short_aggressive_entry = rsi_4_last > 80
+
+    # Long Exit: RSI(4) closes above 55.
+    long_exit = rsi_4_last > 55
+    # Short Exit: RSI(4) closes under 45.
+    short_exit = rsi_4_last < 45
+
+    return (long_entry * _LONG_ENTRY) | (long_aggressive_entry * _LONG_AGGRESSIVE_ENTRY) | \
+        (long_exit * _LONG_EXIT) | (short_entry * _SHORT_ENTRY) | \
+        (short_aggressive_entry * _SHORT_AGGRESSIVE_ENTRY) | (short_exit * _SHORT_EXIT)
+
+# The rules only look at the latest bar, so results are memoized on the input
+# values themselves; replays and repeated scans of the same bar skip the kernel.
+_cached_rsi_25_75_kernel = functools.lru_cache(maxsize=10_000)(_rsi_25_75_kernel)
+
+def _signals_from_flags(flags: int) -> AggressiveSignals:
+    """Unpacks the signal bits from the kernel into the result tuple."""
+    return AggressiveSignals(
+        bool(flags & _LONG_ENTRY), bool(flags & _LONG_AGGRESSIVE_ENTRY), bool(flags & _LONG_EXIT),
+        bool(flags & _SHORT_ENTRY), bool(flags & _SHORT_AGGRESSIVE_ENTRY), bool(flags & _SHORT_EXIT),
+        "Insufficient data or missing columns" if flags & _NO_DATA else "Checks complete"
+    )
+
+_SIGNALS_TABLE = tuple(_signals_from_flags(flags) for flags in range(2 * _NO_DATA))
+
+def _rsi_25_75_signals(columns: Dict[str, np.ndarray]) -> AggressiveSignals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Ensure there is enough data and the required columns
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        flags = _NO_DATA
+    else:
+        flags = _cached_rsi_25_75_kernel(columns['Close'][-1], columns['SMA_200'][-1], columns['RSI_4'][-1])
+
+    return _SIGNALS_TABLE[flags]
+
+
+def check_rsi_25_75_conditions(data: pd.DataFrame) -> AggressiveSignals:
     """
     Checks the conditions for the RSI 25 & RSI 75 trading strategy.
 
@@ -20,56 +94,49 @@ def check_rsi_25_75_conditions(data: pd.DataFrame) -> Dict[str, bool]:
                              'SMA_200', and 'RSI_4' (4-period RSI).
 
     Returns:
-        Dict[str, bool]: A dictionary containing boolean flags for each condition:
-                         'long_entry': Initial condition to go long.
-                         'long_aggressive_entry': Condition for a second long entry.
-                         'long_exit': Condition to exit a long position.
-                         'short_entry': Initial condition to go short.
-                         'short_aggressive_entry': Condition for a second short entry.
-                         'short_exit': Condition to exit a short position.
+        AggressiveSignals: A named tuple of boolean flags for each condition:
+                           long_entry: Initial condition to go long.
+                           long_aggressive_entry: Condition for a second long entry.
+                           long_exit: Condition to exit a long position.
+                           short_entry: Initial condition to go short.
+                           short_aggressive_entry: Condition for a second short entry.
+                           short_exit: Condition to exit a short position.
     """
-    # Ensure the DataFrame has enough data and the required columns
-    required_columns = ['Close', 'SMA_200', 'RSI_4']
-    if len(data) < 1 or not all(col in data.columns for col in required_columns):
-        return {
-            "long_entry": False, "long_aggressive_entry": False, "long_exit": False,
-            "short_entry": False, "short_aggressive_entry": False, "short_exit": False,
-            "status": "Insufficient data or missing columns"
-        }
-
-    # Get the most recent data
-    latest = data.iloc[-1]
-
-    # --- Long Side Conditions ---
-    is_uptrend = latest['Close'] > latest['SMA_200']
-    
-    # Initial Long Entry: RSI(4) closes under 25 in an uptrend.
-    long_entry_condition = is_uptrend and latest['RSI_4'] < 25
-    
-    # Aggressive Long Entry: RSI(4) closes under 20 in an uptrend.
-    long_aggressive_entry_condition = is_uptrend and latest['RSI_4'] < 20
-    
-    # Long Exit: RSI(4) closes above 55.
-    long_exit_condition = latest['RSI_4'] > 55
+    return _rsi_25_75_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS))
 
-    # --- Short Side Conditions ---
-    is_downtrend = latest['Close'] < latest['SMA_200']
 
-    # Initial Short Entry: RSI(4) closes above 75 in a downtrend.
-    short_entry_condition = is_downtrend and latest['RSI_4'] > 75
+def compute_rsi_25_75_signals(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the RSI 25/75 signals for every bar of a history in one vectorized pass.
 
-    # Aggressive Short Entry: RSI(4) closes above 80 in a downtrend.
-    short_aggressive_entry_condition = is_downtrend and latest['RSI_4'] > 80
+    Row t holds the flags `check_rsi_25_75_conditions` would return for
+    `data.iloc[:t + 1]`, so a backtest can evaluate a whole history at once instead
+    of bar by bar.
 
-    # Short Exit: RSI(4) closes under 45.
-    short_exit_condition = latest['RSI_4'] < 45
-
-    return {
-        "long_entry": long_entry_condition,
-        "long_aggressive_entry": long_aggressive_entry_condition,
-        "long_exit": long_exit_condition,
-        "short_entry": short_entry_condition,
-        "short_aggressive_entry": short_aggressive_entry_condition,
-        "short_exit": short_exit_condition,
-        "status": "Checks complete"
-    }
+    Args:
+        data (pd.DataFrame): A DataFrame with 'Close', 'SMA_200' and 'RSI_4' columns.
+
+    Returns:
+        pd.DataFrame: Boolean 'long_entry', 'long_aggressive_entry', 'long_exit',
+                      'short_entry', 'short_aggressive_entry' and 'short_exit'
+                      columns on the same index as `data`.
+    """
+    columns = [
+        "long_entry", "long_aggressive_entry", "long_exit",
+        "short_entry", "short_aggressive_entry", "short_exit"
+    ]
+    if not _REQUIRED_COLUMNS.issubset(data.columns):
+        return pd.DataFrame(False, index=data.index, columns=columns)
+
+    close, sma_200, rsi_4 = data['Close'], data['SMA_200'], data['RSI_4']
+    is_uptrend = close > sma_200
+    is_downtrend = close < sma_200
+
+    return pd.DataFrame({
+        "long_entry": is_uptrend & (rsi_4 < 25),
+        "long_aggressive_entry": is_uptrend & (rsi_4 < 20),
+        "long_exit": rsi_4 > 55,
+        "short_entry": is_downtrend & (rsi_4 > 75),
+        "short_aggressive_entry": is_downtrend & (rsi_4 > 80),
+        "short_exit": rsi_4 < 45,
+    }, index=data.index)
@@ -0,0 +1,55 @@
+# strategies/signals.py
+
+"""
+Result types returned by the strategy checks.
+
+Each check returns a small immutable tuple instead of a dict, so the signals are
+read by attribute (`signals.long_entry`). Strategies without a given signal
+simply lack the field, so callers that handle several strategies read optional
+signals with `getattr(signals, name, False)`.
+"""
+
+from typing import NamedTuple
+
+class Signals(NamedTuple):
+    """Entry and exit signals for both sides (MDD/MDU, %b and R3)."""
+    long_entry: bool
+    long_exit: bool
+    short_entry: bool
+    short_exit: bool
+    status: str
+
+class AggressiveSignals(NamedTuple):
+    """Entry, aggressive entry and exit signals for both sides (RSI 25/75)."""
+    long_entry: bool
+    long_aggressive_entry: bool
+    long_exit: bool
+    short_entry: bool
+    short_aggressive_entry: bool
+    short_exit: bool
+    status: str
+
+class TieredSignals(NamedTuple):
+    """Initial entry, second entry and exit signals for both sides (RSI 10/6 & 90/94)."""
+    long_initial_entry: bool
+    long_second_entry: bool
+    long_exit: bool
+    short_initial_entry: bool
+    short_second_entry: bool
+    short_exit: bool
+    status: str
+
+class DirectionSignals(NamedTuple):
+    """A single long or short signal (3-Day High/Low)."""
+    long_signal: bool
+    short_signal: bool
+    status: str
+
+class TPSSignals(NamedTuple):
+    """
+    The action for the TPS strategy: 'BUY', 'SELL_SHORT', 'EXIT_LONG', 'EXIT_SHORT'
+    or 'HOLD', and the tranche number (1-4) to execute.
+    """
+    signal: str
+    tranche_to_execute: int
+    status: str
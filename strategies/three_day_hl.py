@@ -5,10 +5,81 @@ Implements the 3-Day High/Low trading strategy from the book "High Probability E
 by Larry Connors and Cesar Alvarez.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Union
+from typing import Dict
 
-def check_three_day_hl_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, str]]:
+from strategies.signals import DirectionSignals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+_REQUIRED_COLUMNS = frozenset({'High', 'Low', 'Close', 'SMA_200', 'SMA_5'})
+# The number of rows the rules look back over
+_MIN_ROWS = 4
+
+# Signal bits returned by the compiled kernel, and the status message of each combination
+_LONG_SIGNAL, _SHORT_SIGNAL, _NO_DATA = 1, 2, 4
+_STATUS_TABLE = {
+    0: "No signal",
+    _LONG_SIGNAL: "Long signal detected",
+    _SHORT_SIGNAL: "Short signal detected",
+    _NO_DATA: "Insufficient data",
+}
+
+# Compiled eagerly for float64 windows, so the first call pays no JIT warm-up. The
+# arrays are typed read-only, which accepts pandas' read-only views without a copy
+# and writable arrays (as passed by the fused kernel) alike.
+@njit("i8(Array(float64, 1, 'A', readonly=True), Array(float64, 1, 'A', readonly=True), f8, f8, f8)", cache=True)
+def _three_day_hl_kernel(
+    high: np.ndarray, low: np.ndarray, close_last: float, sma_200_last: float, sma_5_last: float
+) -> int:
+    """
+    Evaluates the 3-Day High/Low rules on the last four highs and lows.
+    Returns the signal bit that is set, if any.
+    """
+    # Only the side the trend allows is evaluated. Within a side the comparisons
+    # are combined with bitwise & instead of `and`, so the compiled code is
+    # straight-line compares with no short-circuit branches.
+    long_signal = False
+    short_signal = False
+    if close_last > sma_200_last:
+        # Long side rules
+        lower_highs = (high[-1] < high[-2]) & (high[-2] < high[-3]) & (high[-3] < high[-4])
+        lower_lows = (low[-1] < low[-2]) & (low[-2] < low[-3]) & (low[-3] < low[-4])
+        long_signal = (close_last < sma_5_last) & lower_highs & lower_lows
+    elif close_last < sma_200_last:
+        # Short side rules
+        higher_highs = (high[-1] > high[-2]) & (high[-2] > high[-3]) & (high[-3] > high[-4])
+        higher_lows = (low[-1] > low[-2]) & (low[-2] > low[-3]) & (low[-3] > low[-4])
+        short_signal = (close_last > sma_5_last) & higher_highs & higher_lows
+
+    return (long_signal * _LONG_SIGNAL) | (short_signal * _SHORT_SIGNAL)
+
+def _signals_from_flags(flags: int) -> DirectionSignals:
+    """Unpacks the signal bits from the kernel into the result tuple."""
+    return DirectionSignals(bool(flags & _LONG_SIGNAL), bool(flags & _SHORT_SIGNAL), _STATUS_TABLE[flags])
+
+_SIGNALS_TABLE = {flags: _signals_from_flags(flags) for flags in _STATUS_TABLE}
+
+def _three_day_hl_signals(columns: Dict[str, np.ndarray]) -> DirectionSignals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Ensure there is enough data
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        flags = _NO_DATA
+    else:
+        # asarray is a no-op for float64 columns and converts integer prices
+        flags = _three_day_hl_kernel(
+            np.asarray(columns['High'][-4:], dtype=np.float64), np.asarray(columns['Low'][-4:], dtype=np.float64),
+            columns['Close'][-1], columns['SMA_200'][-1], columns['SMA_5'][-1]
+        )
+
+    return _SIGNALS_TABLE[flags]
+
+
+def check_three_day_hl_conditions(data: pd.DataFrame) -> DirectionSignals:
     """
     Checks the conditions for the 3-Day High/Low trading strategy.
 
@@ -17,37 +88,45 @@ def check_three_day_hl_conditions(data: pd.DataFrame) -> Dict[str, Union[bool, s
                              'SMA_200', and 'SMA_5'.
 
     Returns:
-        Dict[str, Union[bool, str]]: A dictionary containing the results of the condition checks.
-                                     'long_signal': True if long conditions are met, False otherwise.
-                                     'short_signal': True if short conditions are met, False otherwise.
-                                     'status': A message indicating the outcome of the checks.
-    """
-    # Ensure the DataFrame has enough data
-    if len(data) < 4:
-        return {"long_signal": False, "short_signal": False, "status": "Insufficient data"}
-
-    # Get the most recent data
-    latest = data.iloc[-1]
-    prev_1 = data.iloc[-2]
-    prev_2 = data.iloc[-3]
-    prev_3 = data.iloc[-4]
-
-    # Long side rules
-    long_trend = latest['Close'] > latest['SMA_200']
-    long_pullback = latest['Close'] < latest['SMA_5']
-    lower_highs = latest['High'] < prev_1['High'] and prev_1['High'] < prev_2['High'] and prev_2['High'] < prev_3['High']
-    lower_lows = latest['Low'] < prev_1['Low'] and prev_1['Low'] < prev_2['Low'] and prev_2['Low'] < prev_3['Low']
-
-    if long_trend and long_pullback and lower_highs and lower_lows:
-        return {"long_signal": True, "short_signal": False, "status": "Long signal detected"}
-
-    # Short side rules
-    short_trend = latest['Close'] < latest['SMA_200']
-    short_rally = latest['Close'] > latest['SMA_5']
-    higher_highs = latest['High'] > prev_1['High'] and prev_1['High'] > prev_2['High'] and prev_2['High'] > prev_3['High']
-    higher_lows = latest['Low'] > prev_1['Low'] and prev_1['Low'] > prev_2['Low'] and prev_2['Low'] > prev_3['Low']
-
-    if short_trend and short_rally and higher_highs and higher_lows:
-        return {"short_signal": True, "long_signal": False, "status": "Short signal detected"}
-
-    return {"long_signal": False, "short_signal": False, "status": "No signal"}
+        DirectionSignals: A named tuple containing the results of the condition checks.
+                          long_signal: True if long conditions are met, False otherwise.
+                          short_signal: True if short conditions are met, False otherwise.
+                          status: A message indicating the outcome of the checks.
+    """
+    return _three_day_hl_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS))
+
+
+def compute_three_day_hl_signals(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Computes the 3-Day High/Low signals for every bar of a history in one vectorized pass.
+
+    Row t holds the flags `check_three_day_hl_conditions` would return for
+    `data.iloc[:t + 1]`, so a backtest can evaluate a whole history at once instead
+    of bar by bar.
+
+    Args:
+        data (pd.DataFrame): A DataFrame with 'High', 'Low', 'Close', 'SMA_200' and 'SMA_5' columns.
+
+    Returns:
+        pd.DataFrame: Boolean 'long_signal' and 'short_signal' columns on the same index as `data`.
+    """
+    if not _REQUIRED_COLUMNS.issubset(data.columns):
+        return pd.DataFrame(False, index=data.index, columns=["long_signal", "short_signal"])
+
+    close, sma_200, sma_5 = data['Close'], data['SMA_200'], data['SMA_5']
+    high, low = data['High'], data['Low']
+    has_history = np.arange(len(data)) >= 3
+
+    def falling_3_days(values: pd.Series) -> pd.Series:
+        return (values < values.shift(1)) & (values.shift(1) < values.shift(2)) & (values.shift(2) < values.shift(3))
+
+    def rising_3_days(values: pd.Series) -> pd.Series:
+        return (values > values.shift(1)) & (values.shift(1) > values.shift(2)) & (values.shift(2) > values.shift(3))
+
+    long_signal = (close > sma_200) & (close < sma_5) & falling_3_days(high) & falling_3_days(low) & has_history
+    short_signal = (close < sma_200) & (close > sma_5) & rising_3_days(high) & rising_3_days(low) & has_history
+
+    return pd.DataFrame({
+        "long_signal": long_signal,
+        "short_signal": short_signal & ~long_signal,
+    }, index=data.index)
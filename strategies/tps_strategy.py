@@ -5,13 +5,124 @@ Implements the TPS (Time-Price-Scale-in) trading strategy from the book
 "High Probability ETF Trading" by Larry Connors and Cesar Alvarez.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, Union
+from typing import Dict, Any
+
+from strategies.signals import TPSSignals
+from utils._frames import tail_arrays
+from utils._njit import njit
+
+# Actions returned by the compiled kernel
+_HOLD, _EXIT_LONG, _EXIT_SHORT, _LONG_INITIAL, _LONG_SCALE_IN, _SHORT_INITIAL, _SHORT_SCALE_IN = range(7)
+_SIDE_CODES = {'long': 1, 'short': -1}
+
+_REQUIRED_COLUMNS = frozenset({'Close', 'SMA_200', 'RSI_2'})
+# The number of rows the rules look back over
+_MIN_ROWS = 2
+
+# Results that never vary are built once; the tuples are immutable, so sharing them is safe
+_HOLD_SIGNALS = TPSSignals("HOLD", 0, "No new signal")
+_NO_DATA_SIGNALS = TPSSignals("HOLD", 0, "Insufficient data or missing columns")
+_ACTION_SIGNALS = {
+    _EXIT_LONG: TPSSignals('EXIT_LONG', 0, 'Long exit signal: RSI > 70'),
+    _EXIT_SHORT: TPSSignals('EXIT_SHORT', 0, 'Short exit signal: RSI < 30'),
+    _LONG_INITIAL: TPSSignals('BUY', 1, 'TPS Long Tranche 1: RSI < 25 for 2 days'),
+    _SHORT_INITIAL: TPSSignals('SELL_SHORT', 1, 'TPS Short Tranche 1: RSI > 75 for 2 days'),
+}
+# Scale-ins by tranche number. Tranche 1 is reached when a position is open but
+# no tranche has been recorded yet, so every integral tranche count is covered.
+_LONG_SCALE_IN_SIGNALS = {
+    n: TPSSignals('BUY', n, f"TPS Long Tranche {n}: Price below last entry") for n in range(1, 5)
+}
+_SHORT_SCALE_IN_SIGNALS = {
+    n: TPSSignals('SELL_SHORT', n, f"TPS Short Tranche {n}: Price above last entry") for n in range(1, 5)
+}
+
+@njit(cache=True)
+def _tps_kernel(
+    close_last: float,
+    sma_200_last: float,
+    rsi_2: np.ndarray,
+    is_open: bool,
+    side: int,
+    tranches_filled: float,
+    last_entry_price: float
+) -> int:
+    """
+    Evaluates the TPS rules on the last two 2-period RSI values and the position
+    state (side is 1 for long, -1 for short). Returns one of the action codes above.
+    """
+    # --- Exit Conditions (checked first) ---
+    if is_open:
+        if side == 1 and rsi_2[-1] > 70:
+            return _EXIT_LONG
+        if side == -1 and rsi_2[-1] < 30:
+            return _EXIT_SHORT
+
+    # --- Long Side Logic ---
+    if close_last > sma_200_last:
+        # Tranche 1 (Initial Entry)
+        if not is_open:
+            if rsi_2[-1] < 25 and rsi_2[-2] < 25:
+                return _LONG_INITIAL
+        # Scale-in Logic (Tranches 2, 3, 4)
+        elif side == 1 and tranches_filled < 4:
+            if close_last < last_entry_price:
+                return _LONG_SCALE_IN
+
+    # --- Short Side Logic ---
+    if close_last < sma_200_last:
+        # Tranche 1 (Initial Entry)
+        if not is_open:
+            if rsi_2[-1] > 75 and rsi_2[-2] > 75:
+                return _SHORT_INITIAL
+        # Scale-in Logic (Tranches 2, 3, 4)
+        elif side == -1 and tranches_filled < 4:
+            if close_last > last_entry_price:
+                return _SHORT_SCALE_IN
+
+    return _HOLD
+
+def _tps_signals(
+    columns: Dict[str, np.ndarray],
+    position_state: Dict[str, Any]
+) -> TPSSignals:
+    """
+    Evaluates the strategy on column arrays keyed by column name, so callers that
+    already hold the arrays (see strategies/fused.py) skip the DataFrame lookups.
+    """
+    # Ensure there is enough data and the required columns
+    if not _REQUIRED_COLUMNS.issubset(columns) or len(columns['Close']) < _MIN_ROWS:
+        return _NO_DATA_SIGNALS
+
+    # Read the position state once
+    is_open = bool(position_state.get('is_open', False))
+    side = position_state.get('side')
+    tranches_filled = position_state.get('tranches_filled', 0)
+    last_entry_price = position_state.get('last_entry_price', 0.0)
+
+    action = _tps_kernel(
+        columns['Close'][-1], columns['SMA_200'][-1], columns['RSI_2'][-2:],
+        is_open, _SIDE_CODES.get(side, 0), tranches_filled, last_entry_price
+    )
+
+    if action == _HOLD:
+        return _HOLD_SIGNALS
+    if action == _LONG_SCALE_IN:
+        next_tranche = tranches_filled + 1
+        return _LONG_SCALE_IN_SIGNALS.get(next_tranche) or \
+            TPSSignals('BUY', next_tranche, f"TPS Long Tranche {next_tranche}: Price below last entry")
+    if action == _SHORT_SCALE_IN:
+        next_tranche = tranches_filled + 1
+        return _SHORT_SCALE_IN_SIGNALS.get(next_tranche) or \
+            TPSSignals('SELL_SHORT', next_tranche, f"TPS Short Tranche {next_tranche}: Price above last entry")
+    return _ACTION_SIGNALS[action]
 
 def check_tps_conditions(
     data: pd.DataFrame,
     position_state: Dict[str, Any]
-) -> Dict[str, Union[bool, str, int]]:
+) -> TPSSignals:
     """
     Checks the conditions for the TPS trading strategy.
 
@@ -30,78 +141,9 @@ def check_tps_conditions(
             'last_entry_price' (float): The closing price of the last tranche entry.
 
     Returns:
-        Dict[str, Union[bool, str, int]]: A dictionary with trading signals.
-            'signal' (str): 'BUY', 'SELL_SHORT', 'EXIT_LONG', 'EXIT_SHORT', or 'HOLD'.
-            'tranche_to_execute' (int): The tranche number to execute (1-4).
-            'status' (str): A descriptive message of the condition met.
+        TPSSignals: A named tuple with trading signals.
+            signal (str): 'BUY', 'SELL_SHORT', 'EXIT_LONG', 'EXIT_SHORT', or 'HOLD'.
+            tranche_to_execute (int): The tranche number to execute (1-4).
+            status (str): A descriptive message of the condition met.
     """
-    # Initialize default return values
-    signals = {
-        "signal": "HOLD",
-        "tranche_to_execute": 0,
-        "status": "No new signal"
-    }
-
-    # Ensure the DataFrame has enough data and the required columns
-    required_columns = ['Close', 'SMA_200', 'RSI_2']
-    if len(data) < 2 or not all(col in data.columns for col in required_columns):
-        signals["status"] = "Insufficient data or missing columns"
-        return signals
-
-    latest = data.iloc[-1]
-    prev_1 = data.iloc[-2]
-
-    # --- Exit Conditions (checked first) ---
-    if position_state.get('is_open'):
-        if position_state.get('side') == 'long' and latest['RSI_2'] > 70:
-            signals['signal'] = 'EXIT_LONG'
-            signals['status'] = 'Long exit signal: RSI > 70'
-            return signals
-        if position_state.get('side') == 'short' and latest['RSI_2'] < 30:
-            signals['signal'] = 'EXIT_SHORT'
-            signals['status'] = 'Short exit signal: RSI < 30'
-            return signals
-
-    # --- Entry and Scale-in Conditions ---
-    is_uptrend = latest['Close'] > latest['SMA_200']
-    is_downtrend = latest['Close'] < latest['SMA_200']
-
-    # --- Long Side Logic ---
-    if is_uptrend:
-        # Tranche 1 (Initial Entry)
-        if not position_state.get('is_open'):
-            rsi_below_25_2_days = latest['RSI_2'] < 25 and prev_1['RSI_2'] < 25
-            if rsi_below_25_2_days:
-                signals['signal'] = 'BUY'
-                signals['tranche_to_execute'] = 1
-                signals['status'] = 'TPS Long Tranche 1: RSI < 25 for 2 days'
-                return signals
-        # Scale-in Logic (Tranches 2, 3, 4)
-        elif position_state.get('side') == 'long' and position_state['tranches_filled'] < 4:
-            if latest['Close'] < position_state['last_entry_price']:
-                next_tranche = position_state['tranches_filled'] + 1
-                signals['signal'] = 'BUY'
-                signals['tranche_to_execute'] = next_tranche
-                signals['status'] = f"TPS Long Tranche {next_tranche}: Price below last entry"
-                return signals
-
-    # --- Short Side Logic ---
-    if is_downtrend:
-        # Tranche 1 (Initial Entry)
-        if not position_state.get('is_open'):
-            rsi_above_75_2_days = latest['RSI_2'] > 75 and prev_1['RSI_2'] > 75
-            if rsi_above_75_2_days:
-                signals['signal'] = 'SELL_SHORT'
-                signals['tranche_to_execute'] = 1
-                signals['status'] = 'TPS Short Tranche 1: RSI > 75 for 2 days'
-                return signals
-        # Scale-in Logic (Tranches 2, 3, 4)
-        elif position_state.get('side') == 'short' and position_state['tranches_filled'] < 4:
-            if latest['Close'] > position_state['last_entry_price']:
-                next_tranche = position_state['tranches_filled'] + 1
-                signals['signal'] = 'SELL_SHORT'
-                signals['tranche_to_execute'] = next_tranche
-                signals['status'] = f"TPS Short Tranche {next_tranche}: Price above last entry"
-                return signals
-
-    return signals
+    return _tps_signals(tail_arrays(data, _REQUIRED_COLUMNS, _MIN_ROWS), position_state)
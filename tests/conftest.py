@@ -0,0 +1,33 @@
+# tests/conftest.py
+
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+import pytest
+
+def _make_prices(
+    n: int = 320,
+    seed: int = 32,
+    volatility: float = 0.015,
+    spread: Optional[float] = None,
+    start: Optional[str] = "2021-01-04",
+    end: Optional[pd.Timestamp] = None,
+    tz: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Builds a random-walk High/Low/Close frame on business days, with closes rounded
+    to cents. The bar range is `spread` either side of the close, or a random 0.10
+    to 1.00 when it is None, which keeps the series choppy enough for every strategy
+    rule to fire. Pass `end` instead of `start` to end on a given day.
+    """
+    rng = np.random.default_rng(seed)
+    close = np.round(100 * np.exp(np.cumsum(rng.normal(0, volatility, n))), 2)
+    half_range = np.round(rng.uniform(0.1, 1.0, n), 2) if spread is None else spread
+    index = pd.bdate_range(start=None if end is not None else start, end=end, periods=n, tz=tz, name="Date")
+    return pd.DataFrame({"High": close + half_range, "Low": close - half_range, "Close": close}, index=index)
+
+@pytest.fixture
+def make_prices() -> Callable[..., pd.DataFrame]:
+    """Returns the synthetic price factory shared by the indicator, strategy and data tests."""
+    return _make_prices
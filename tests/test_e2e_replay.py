@@ -0,0 +1,68 @@
+# tests/test_e2e_replay.py
+
+import copy
+import io
+
+import pytest
+
+from utils.financial_calculations import calculate_indicators
+from test_e2e_strategies import (
+    STRATEGY_MAP, VECTORIZED_STRATEGY_MAP, LogContext,
+    _replay_day_by_day, _replay_from_masks, build_daily_windows
+)
+
+SYMBOL = "TEST"
+# Large enough that the risk-sized position is at least one share
+STARTING_VALUE = 1_000_000.0
+
+def _open_position(side: str) -> dict:
+    """A position carried over from an earlier run, as loaded from the portfolio JSON."""
+    return {
+        "is_open": True, "side": side, "entry_date": "2020-12-31",
+        "entry_price": 98.5, "quantity": 12, "tranches_filled": 1
+    }
+
+def _new_logs() -> LogContext:
+    """A LogContext writing to in-memory files."""
+    return LogContext(io.StringIO(), io.StringIO(), io.StringIO())
+
+@pytest.mark.parametrize("strategy_name", list(VECTORIZED_STRATEGY_MAP))
+@pytest.mark.parametrize("start_side", [None, "long", "short"])
+def test_mask_replay_matches_the_per_bar_loop(strategy_name, start_side, make_prices):
+    """
+    Tests that the compiled replay over precomputed signal masks produces the same
+    trades, equity curve, portfolio value and final position as checking the
+    strategy on every bar's window, including with a position already open.
+    """
+    data = calculate_indicators(make_prices(500, seed=11))
+    close_prices = data["Close"].to_numpy()
+    dates = data.index.strftime("%Y-%m-%d").tolist()
+    portfolio_key = f"{SYMBOL}_{strategy_name}"
+    initial_state = {portfolio_key: _open_position(start_side)} if start_side else {}
+    check = STRATEGY_MAP[strategy_name]
+
+    replay_state, replay_values = copy.deepcopy(initial_state), {strategy_name: STARTING_VALUE}
+    replay_logs = _new_logs()
+    masks = VECTORIZED_STRATEGY_MAP[strategy_name](data)
+    _replay_from_masks(
+        SYMBOL, strategy_name, masks, close_prices, dates, replay_state, replay_values, replay_logs
+    )
+
+    # The reference checks every bar from day 1, with no warm-up skipping
+    loop_state, loop_values = copy.deepcopy(initial_state), {strategy_name: STARTING_VALUE}
+    loop_logs = _new_logs()
+    _replay_day_by_day(
+        SYMBOL, strategy_name, lambda window, position: check(window), build_daily_windows(data),
+        close_prices, dates, loop_state, loop_values, 0, loop_logs
+    )
+
+    trades = replay_logs.trade_file.getvalue()
+    # 3-Day High/Low has no exit rule, so it only ever opens a position
+    if 'long_exit' in masks.columns:
+        assert trades
+    else:
+        assert replay_state
+    assert trades == loop_logs.trade_file.getvalue()
+    assert replay_logs.equity_history == loop_logs.equity_history
+    assert replay_values == loop_values
+    assert replay_state == loop_state
@@ -8,12 +8,17 @@ hypothetical portfolio with dynamic P&L, and logs all trades and their performan
 V3: Adds a tqdm progress bar for better status tracking.
 """
 
+import numpy as np
 import pandas as pd
+import csv
 import json
 import logging
 import os
-from datetime import datetime
-from typing import Dict
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, TextIO, Tuple
 from tqdm import tqdm
 
 # Adjust path to import from the root directory
@@ -21,16 +26,17 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from data_manager import DataManager
-from utils.financial_calculations import calculate_indicators
+from utils.financial_calculations import INDICATOR_COLUMNS, INDICATORS_VERSION, calculate_indicators
 from configs.ibkr_config import PORTFOLIO_VALUE_USD, RISK_PER_TRADE_PERCENT
+from utils._njit import njit
 
 # --- Import all strategy functions ---
-from strategies.three_day_hl import check_three_day_hl_conditions
-from strategies.rsi_25_75 import check_rsi_25_75_conditions
-from strategies.r3_strategy import check_r3_conditions
-from strategies.percent_b_strategy import check_percent_b_conditions
-from strategies.mdd_mdu import check_mdd_mdu_conditions
-from strategies.rsi_10_6_90_94 import check_rsi_10_6_90_94_conditions
+from strategies.three_day_hl import check_three_day_hl_conditions, compute_three_day_hl_signals
+from strategies.rsi_25_75 import check_rsi_25_75_conditions, compute_rsi_25_75_signals
+from strategies.r3_strategy import check_r3_conditions, compute_r3_signals
+from strategies.percent_b_strategy import check_percent_b_conditions, compute_percent_b_signals
+from strategies.mdd_mdu import check_mdd_mdu_conditions, compute_mdd_mdu_signals
+from strategies.rsi_10_6_90_94 import check_rsi_10_6_90_94_conditions, compute_rsi_10_6_90_94_signals
 from strategies.tps_strategy import check_tps_conditions
 
 # --- Configure Logging ---
@@ -42,6 +48,10 @@ PORTFOLIO_STATE_PATH = "data/test_portfolio.json"
 SIGNAL_LOG_PATH = "data/test_results.csv"
 TRADE_LOG_PATH = "data/trade_log.csv"
 EQUITY_CURVE_LOG_PATH = "data/equity_curve.csv"
+INDICATOR_CACHE_DIR = "data/indicator_cache"
+
+# The longest history any strategy reads (MDD/MDU: 5 prior days + the current day)
+MAX_LOOKBACK = 6
 
 STRATEGY_MAP = {
     "3_day_hl": check_three_day_hl_conditions,
@@ -52,6 +62,26 @@ STRATEGY_MAP = {
     "rsi_10_6_90_94": check_rsi_10_6_90_94_conditions,
     "tps": check_tps_conditions,
 }
+# Whole-history versions of the strategies whose signals do not depend on the open
+# position. Their signals are computed for every day at once; the others (TPS) are
+# checked day by day during the simulation.
+VECTORIZED_STRATEGY_MAP = {
+    "3_day_hl": compute_three_day_hl_signals,
+    "rsi_25_75": compute_rsi_25_75_signals,
+    "r3": compute_r3_signals,
+    "percent_b": compute_percent_b_signals,
+    "mdd_mdu": compute_mdd_mdu_signals,
+    "rsi_10_6_90_94": compute_rsi_10_6_90_94_signals,
+}
+
+# The signal fields that open a position on each side
+LONG_ENTRY_KEYS = ('long_entry', 'long_signal', 'long_initial_entry')
+SHORT_ENTRY_KEYS = ('short_entry', 'short_signal', 'short_initial_entry')
+_SIDE_CODES = {'long': 1, 'short': -1}
+_SIDE_NAMES = {1: 'long', -1: 'short'}
+# Shared stand-in for a missing position, so flat days allocate nothing. Read-only,
+# since it is handed to the strategy checks.
+_NO_POSITION = MappingProxyType({})
 
 # --- Helper Functions ---
 
@@ -60,8 +90,9 @@ def load_etf_universe(filepath: str) -> list[str]:
     if not os.path.exists(filepath):
         logging.error(f"ETF universe file not found at {filepath}.")
         return []
-    df = pd.read_csv(filepath)
-    return df['Symbol'].tolist()
+    # A one-column list of symbols does not need a DataFrame
+    with open(filepath, newline='') as f:
+        return [row['Symbol'] for row in csv.DictReader(f) if row.get('Symbol')]
 
 def load_portfolio_state(filepath: str) -> dict:
     """Loads the portfolio state from a JSON file."""
@@ -93,17 +124,59 @@ def initialize_log_files():
             "Date", "Strategy", "PortfolioValue"
         ]).to_csv(EQUITY_CURVE_LOG_PATH, index=False)
 
-def log_signal(symbol: str, strategy: str, price: float, signals: dict):
-    """Logs generated signals to the results CSV file."""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    true_signals = {k: v for k, v in signals.items() if isinstance(v, bool) and v}
-    if true_signals:
-        details = json.dumps(true_signals)
-        new_log = pd.DataFrame([[timestamp, symbol, strategy, "Signal Found", price, details]],
-                               columns=["Timestamp", "Symbol", "Strategy", "Signal", "Price", "Details"])
-        new_log.to_csv(SIGNAL_LOG_PATH, mode='a', header=False, index=False)
-
-def log_trade(trade_details: dict) -> float:
+@dataclass
+class LogContext:
+    """The CSV log files of a run, opened once and written through buffered csv writers."""
+    signal_file: TextIO
+    trade_file: TextIO
+    equity_file: TextIO
+    signals: Any = field(init=False)
+    trades: Any = field(init=False)
+    equity: Any = field(init=False)
+    # The JSON details of each distinct combination of signal names
+    details: Dict[Tuple[str, ...], str] = field(default_factory=dict)
+    # The (date, portfolio value) series of each strategy, written out on close
+    equity_history: Dict[str, List[Tuple[str, float]]] = field(default_factory=lambda: defaultdict(list))
+
+    def __post_init__(self):
+        self.signals = csv.writer(self.signal_file, lineterminator='\n')
+        self.trades = csv.writer(self.trade_file, lineterminator='\n')
+        self.equity = csv.writer(self.equity_file, lineterminator='\n')
+
+    def close(self):
+        """Writes the equity curve of each strategy, then flushes and closes every log file."""
+        for strategy, rows in self.equity_history.items():
+            self.equity.writerows((date, strategy, value) for date, value in rows)
+        self.equity_history.clear()
+        for f in (self.signal_file, self.trade_file, self.equity_file):
+            f.close()
+
+def open_log_files() -> LogContext:
+    """Opens the CSV log files for appending, once for the whole run."""
+    return LogContext(*(
+        open(path, 'a', newline='', buffering=1 << 20)
+        for path in (SIGNAL_LOG_PATH, TRADE_LOG_PATH, EQUITY_CURVE_LOG_PATH)
+    ))
+
+def log_signal(logs: LogContext, date: str, symbol: str, strategy: str, price: float, signals: NamedTuple):
+    """Logs generated signals to the results CSV file, stamped with the bar's date."""
+    true_flags = tuple(k for k, v in signals._asdict().items() if isinstance(v, bool) and v)
+    if true_flags:
+        log_signal_flags(logs, date, symbol, strategy, price, true_flags)
+
+def log_signal_flags(
+    logs: LogContext, date: str, symbol: str, strategy: str, price: float, flags: Tuple[str, ...]
+):
+    """
+    Logs a signal row given the names of the signals found. Only a handful of distinct
+    combinations occur, so each one is serialized to JSON once per run.
+    """
+    details = logs.details.get(flags)
+    if details is None:
+        details = logs.details[flags] = json.dumps(dict.fromkeys(flags, True))
+    logs.signals.writerow((date, symbol, strategy, "Signal Found", price, details))
+
+def log_trade(logs: LogContext, trade_details: dict) -> float:
     """Logs a completed trade and returns the P&L."""
     pnl = 0
     if trade_details['Side'] == 'long':
@@ -112,15 +185,82 @@ def log_trade(trade_details: dict) -> float:
         pnl = (trade_details['EntryPrice'] - trade_details['ExitPrice']) * trade_details['Quantity']
 
     trade_details['P&L'] = round(pnl, 2)
-    new_log = pd.DataFrame([trade_details])
-    new_log.to_csv(TRADE_LOG_PATH, mode='a', header=False, index=False)
+    logs.trades.writerow(trade_details.values())
     return pnl
 
-def log_equity_curve(date: str, strategy: str, portfolio_value: float):
-    """Logs the portfolio value for a given strategy on a specific date."""
-    new_log = pd.DataFrame([[date, strategy, portfolio_value]],
-                           columns=["Date", "Strategy", "PortfolioValue"])
-    new_log.to_csv(EQUITY_CURVE_LOG_PATH, mode='a', header=False, index=False)
+def log_equity_curve(logs: LogContext, date: str, strategy: str, portfolio_value: float):
+    """Records the portfolio value for a given strategy on a specific date."""
+    logs.equity_history[strategy].append((date, portfolio_value))
+
+def load_or_calculate_indicators(symbol: str, historical_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Returns the history with its indicators. Only the indicator columns (and the
+    closes they were computed from) are cached; they are reused when an earlier run
+    computed them with the same indicator code from the same dates and closes, and
+    are added onto the freshly fetched history so its other columns are never stale.
+    """
+    cache_path = os.path.join(INDICATOR_CACHE_DIR, f"{symbol.upper()}_v{INDICATORS_VERSION}.parquet")
+    if os.path.exists(cache_path):
+        try:
+            cached = pd.read_parquet(cache_path, engine='pyarrow')
+            if cached.index.equals(historical_data.index) and \
+                    cached['Close'].equals(historical_data['Close']):
+                return historical_data.assign(**{col: cached[col].to_numpy() for col in INDICATOR_COLUMNS})
+        except Exception as e:
+            logging.warning(f"Could not read indicator cache for {symbol}: {e}")
+
+    data_with_indicators = calculate_indicators(historical_data)
+    try:
+        os.makedirs(INDICATOR_CACHE_DIR, exist_ok=True)
+        data_with_indicators[['Close', *INDICATOR_COLUMNS]].to_parquet(cache_path, engine='pyarrow')
+    except Exception as e:
+        logging.warning(f"Could not write indicator cache for {symbol}: {e}")
+    return data_with_indicators
+
+def build_daily_windows(data_with_indicators: pd.DataFrame) -> list[pd.DataFrame]:
+    """
+    Returns, for each day, the last MAX_LOOKBACK rows up to and including it. That
+    is all any strategy reads, so each window is built once and shared.
+    """
+    return [
+        data_with_indicators.iloc[max(0, i + 1 - MAX_LOOKBACK):i + 1]
+        for i in range(len(data_with_indicators))
+    ]
+
+def precompute_symbol_signals(
+    symbol: str, historical_data: pd.DataFrame
+) -> Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Computes a symbol's indicators and the whole-history signals of every strategy
+    in VECTORIZED_STRATEGY_MAP. Runs in a worker process.
+
+    Returns:
+        Tuple[pd.DataFrame, Dict[str, pd.DataFrame]]: The history with indicators, and
+            each strategy's boolean signal columns on the same index.
+    """
+    data_with_indicators = load_or_calculate_indicators(symbol, historical_data)
+    signal_masks = {
+        strategy_name: compute_func(data_with_indicators)
+        for strategy_name, compute_func in VECTORIZED_STRATEGY_MAP.items()
+    }
+    return data_with_indicators, signal_masks
+
+def _any_of(masks: pd.DataFrame, keys: Tuple[str, ...]) -> np.ndarray:
+    """True on the days where any of the `keys` columns present in `masks` is set."""
+    columns = [key for key in keys if key in masks.columns]
+    return masks[columns].to_numpy().any(axis=1) if columns else np.zeros(len(masks), dtype=bool)
+
+def _signal_flags(masks: pd.DataFrame) -> list[Optional[Tuple[str, ...]]]:
+    """
+    The names of the signals set on each day, in column order, or None on days
+    without any signal.
+    """
+    values = masks.to_numpy()
+    columns = list(masks.columns)
+    flags: list[Optional[Tuple[str, ...]]] = [None] * len(masks)
+    for i in np.flatnonzero(values.any(axis=1)):
+        flags[i] = tuple(col for col, flag in zip(columns, values[i]) if flag)
+    return flags
 
 def calculate_position_size(price: float, portfolio_value: float) -> int:
     """Calculates share quantity based on the CURRENT portfolio value."""
@@ -129,10 +269,226 @@ def calculate_position_size(price: float, portfolio_value: float) -> int:
     trade_unit_value = portfolio_value * (RISK_PER_TRADE_PERCENT / 100)
     return int(trade_unit_value / price)
 
+@njit(cache=True)
+def _simulate_positions(
+    long_entries: np.ndarray,
+    short_entries: np.ndarray,
+    long_exits: np.ndarray,
+    short_exits: np.ndarray,
+    close: np.ndarray,
+    side: int,
+    entry_price: float,
+    quantity: int,
+    portfolio_value: float,
+    risk_fraction: float
+):
+    """
+    Runs the open/close state machine of one strategy over precomputed signal masks,
+    starting from day 1 with the given position (side 1 long, -1 short, 0 flat).
+    Position sizes follow calculate_position_size on the running portfolio value.
+
+    Returns the entry index, exit index, side and quantity of every closed trade
+    (entry index -1 for the position held at the start), then the final side,
+    entry index and quantity.
+    """
+    n = len(close)
+    trade_entries = np.empty(n, dtype=np.int64)
+    trade_exits = np.empty(n, dtype=np.int64)
+    trade_sides = np.empty(n, dtype=np.int64)
+    trade_quantities = np.empty(n, dtype=np.int64)
+    count = 0
+    entry_index = -1
+    for i in range(1, n):
+        if side != 0:
+            if (side == 1 and long_exits[i]) or (side == -1 and short_exits[i]):
+                trade_entries[count] = entry_index
+                trade_exits[count] = i
+                trade_sides[count] = side
+                trade_quantities[count] = quantity
+                count += 1
+                if side == 1:
+                    portfolio_value += (close[i] - entry_price) * quantity
+                else:
+                    portfolio_value += (entry_price - close[i]) * quantity
+                side = 0
+        else:
+            new_side = 1 if long_entries[i] else (-1 if short_entries[i] else 0)
+            if new_side != 0 and close[i] > 0:
+                size = int(portfolio_value * risk_fraction / close[i])
+                if size > 0:
+                    side = new_side
+                    entry_index = i
+                    entry_price = close[i]
+                    quantity = size
+    return (
+        trade_entries[:count], trade_exits[:count], trade_sides[:count], trade_quantities[:count],
+        side, entry_index, quantity
+    )
+
+def _replay_from_masks(
+    symbol: str,
+    strategy_name: str,
+    masks: pd.DataFrame,
+    close_prices: np.ndarray,
+    dates: list[str],
+    portfolio_state: dict,
+    portfolio_values: Dict[str, float],
+    logs: LogContext
+):
+    """Replays one strategy from its precomputed signal masks with the compiled state machine."""
+    portfolio_key = f"{symbol}_{strategy_name}"
+    for i, flags in enumerate(_signal_flags(masks)):
+        if i > 0 and flags is not None:
+            log_signal_flags(logs, dates[i], symbol, strategy_name, close_prices[i], flags)
+
+    position = portfolio_state.get(portfolio_key, _NO_POSITION)
+    is_open = bool(position.get('is_open'))
+    entries, exits, sides, quantities, side, entry_index, quantity = _simulate_positions(
+        _any_of(masks, LONG_ENTRY_KEYS), _any_of(masks, SHORT_ENTRY_KEYS),
+        _any_of(masks, ('long_exit',)), _any_of(masks, ('short_exit',)),
+        np.asarray(close_prices, dtype=np.float64),
+        _SIDE_CODES.get(position.get('side'), 0) if is_open else 0,
+        float(position.get('entry_price', 0.0)) if is_open else 0.0,
+        int(position.get('quantity', 0)) if is_open else 0,
+        float(portfolio_values[strategy_name]),
+        RISK_PER_TRADE_PERCENT / 100
+    )
+
+    for entry, exit_, trade_side, trade_quantity in zip(entries, exits, sides, quantities):
+        if entry < 0:
+            entry_date, entry_price = position['entry_date'], position['entry_price']
+        else:
+            entry_date, entry_price = dates[entry], close_prices[entry]
+        trade = {
+            "Symbol": symbol, "Strategy": strategy_name,
+            "Side": _SIDE_NAMES[trade_side], "EntryDate": entry_date,
+            "EntryPrice": entry_price, "ExitDate": dates[exit_],
+            "ExitPrice": close_prices[exit_], "Quantity": int(trade_quantity)
+        }
+        pnl = log_trade(logs, trade)
+        portfolio_values[strategy_name] += pnl
+        log_equity_curve(logs, dates[exit_], strategy_name, portfolio_values[strategy_name])
+
+    if side != 0 and entry_index >= 0:
+        portfolio_state[portfolio_key] = {
+            "is_open": True, "side": _SIDE_NAMES[side], "entry_date": dates[entry_index],
+            "entry_price": close_prices[entry_index], "quantity": int(quantity),
+            "tranches_filled": 1
+        }
+    elif side == 0 and len(exits):
+        portfolio_state.pop(portfolio_key, None)
+
+def _replay_day_by_day(
+    symbol: str,
+    strategy_name: str,
+    strategy_func: Callable,
+    daily_windows: list[pd.DataFrame],
+    close_prices: np.ndarray,
+    dates: list[str],
+    portfolio_state: dict,
+    portfolio_values: Dict[str, float],
+    warmup_end: int,
+    logs: LogContext
+):
+    """
+    Replays one position-dependent strategy by checking it on every day's window.
+    Days before `warmup_end` (where SMA_200 is undefined, so no entry can fire) are
+    skipped unless a position is already open.
+    """
+    portfolio_key = f"{symbol}_{strategy_name}"
+    start = 1 if portfolio_state.get(portfolio_key, _NO_POSITION).get('is_open') else max(1, warmup_end)
+
+    for i in range(start, len(daily_windows)):
+        current_price = close_prices[i]
+        current_date = dates[i]
+        position = portfolio_state.get(portfolio_key, _NO_POSITION)
+
+        signals = strategy_func(daily_windows[i], position)
+        log_signal(logs, current_date, symbol, strategy_name, current_price, signals)
+
+        if position.get('is_open'):
+            exit_signal = (position['side'] == 'long' and getattr(signals, 'long_exit', False)) or \
+                          (position['side'] == 'short' and getattr(signals, 'short_exit', False))
+
+            if exit_signal:
+                trade = {
+                    "Symbol": symbol, "Strategy": strategy_name,
+                    "Side": position['side'], "EntryDate": position['entry_date'],
+                    "EntryPrice": position['entry_price'], "ExitDate": current_date,
+                    "ExitPrice": current_price, "Quantity": position['quantity']
+                }
+                pnl = log_trade(logs, trade)
+                portfolio_values[strategy_name] += pnl
+                log_equity_curve(logs, current_date, strategy_name, portfolio_values[strategy_name])
+                del portfolio_state[portfolio_key]
+
+        elif not position.get('is_open'):
+            side = None
+            if any(getattr(signals, key, False) for key in LONG_ENTRY_KEYS):
+                side = 'long'
+            elif any(getattr(signals, key, False) for key in SHORT_ENTRY_KEYS):
+                side = 'short'
+
+            if side:
+                quantity = calculate_position_size(current_price, portfolio_values[strategy_name])
+                if quantity > 0:
+                    portfolio_state[portfolio_key] = {
+                        "is_open": True, "side": side, "entry_date": current_date,
+                        "entry_price": current_price, "quantity": quantity,
+                        "tranches_filled": 1
+                    }
+
+def simulate_symbol(
+    symbol: str,
+    data_with_indicators: pd.DataFrame,
+    signal_masks: Dict[str, pd.DataFrame],
+    portfolio_state: dict,
+    portfolio_values: Dict[str, float],
+    logs: LogContext
+):
+    """
+    Replays every strategy over one symbol's history, opening and closing positions
+    in `portfolio_state` and accumulating P&L in `portfolio_values`. Strategies with
+    precomputed `signal_masks` are replayed from those; the rest are checked day by day.
+    """
+    # Prices and dates are read from plain arrays instead of per-row lookups
+    close_prices = data_with_indicators['Close'].to_numpy()
+    dates = data_with_indicators.index.strftime('%Y-%m-%d').tolist()
+    daily_windows = None
+    # The first day with a defined SMA_200: every entry rule compares against it
+    defined = np.flatnonzero(data_with_indicators['SMA_200'].notna().to_numpy())
+    warmup_end = int(defined[0]) if len(defined) else len(data_with_indicators)
+
+    # --- Nested Progress Bar for Strategies ---
+    for strategy_name, strategy_func in tqdm(STRATEGY_MAP.items(), desc=f"Testing {symbol} Strategies", leave=False):
+        masks = signal_masks.get(strategy_name)
+        if masks is not None:
+            _replay_from_masks(
+                symbol, strategy_name, masks, close_prices, dates, portfolio_state, portfolio_values, logs
+            )
+        else:
+            if daily_windows is None:
+                daily_windows = build_daily_windows(data_with_indicators)
+            _replay_day_by_day(
+                symbol, strategy_name, strategy_func, daily_windows, close_prices, dates,
+                portfolio_state, portfolio_values, warmup_end, logs
+            )
+
 # --- Main Test Runner ---
 
-def run_e2e_test():
-    """Main function to run the end-to-end strategy test."""
+def run_e2e_test(max_workers: Optional[int] = None):
+    """
+    Main function to run the end-to-end strategy test.
+
+    Indicators and the whole-history signals of the position-independent strategies
+    are computed for every symbol in parallel worker processes. The portfolio
+    simulation itself runs in this process, symbol by symbol in universe order,
+    because position sizes depend on the P&L of the symbols simulated before.
+
+    Args:
+        max_workers (Optional[int]): Number of worker processes. Defaults to the
+                                     number of CPUs.
+    """
     logging.info("Starting E2E Strategy Test with Dynamic P&L...")
     initialize_log_files()
 
@@ -146,66 +502,35 @@ def run_e2e_test():
     
     portfolio_values = {strategy: PORTFOLIO_VALUE_USD for strategy in STRATEGY_MAP}
 
-    # --- Main Progress Bar for ETFs ---
-    for symbol in tqdm(etf_symbols, desc="Processing ETFs"):
-        historical_data = data_manager.get_historical_data(symbol, period="5y")
+    # One batched request covers every symbol whose local history cache is stale
+    histories_by_symbol = data_manager.get_historical_data_batch(etf_symbols, period="5y")
+    symbols = []
+    histories = []
+    for symbol in etf_symbols:
+        historical_data = histories_by_symbol.get(symbol, pd.DataFrame())
         if historical_data.empty:
             logging.warning(f"Could not get data for {symbol}. Skipping.")
             continue
-        data_with_indicators = calculate_indicators(historical_data)
-
-        # --- Nested Progress Bar for Strategies ---
-        for strategy_name in tqdm(STRATEGY_MAP.keys(), desc=f"Testing {symbol} Strategies", leave=False):
-            strategy_func = STRATEGY_MAP[strategy_name]
-            
-            for i in range(1, len(data_with_indicators)):
-                daily_data_slice = data_with_indicators.iloc[:i+1]
-                current_day = daily_data_slice.iloc[-1]
-                current_price = current_day['Close']
-                current_date = current_day.name.strftime('%Y-%m-%d')
-
-                portfolio_key = f"{symbol}_{strategy_name}"
-                position = portfolio_state.get(portfolio_key, {})
-
-                if strategy_name == 'tps':
-                    signals = strategy_func(daily_data_slice, position)
-                else:
-                    signals = strategy_func(daily_data_slice)
-
-                log_signal(symbol, strategy_name, current_price, signals)
-
-                if position.get('is_open'):
-                    exit_signal = (position['side'] == 'long' and signals.get('long_exit')) or \
-                                  (position['side'] == 'short' and signals.get('short_exit'))
-
-                    if exit_signal:
-                        trade = {
-                            "Symbol": symbol, "Strategy": strategy_name,
-                            "Side": position['side'], "EntryDate": position['entry_date'],
-                            "EntryPrice": position['entry_price'], "ExitDate": current_date,
-                            "ExitPrice": current_price, "Quantity": position['quantity']
-                        }
-                        pnl = log_trade(trade)
-                        portfolio_values[strategy_name] += pnl
-                        log_equity_curve(current_date, strategy_name, portfolio_values[strategy_name])
-                        del portfolio_state[portfolio_key]
-
-                elif not position.get('is_open'):
-                    side = None
-                    if signals.get('long_entry') or signals.get('long_signal') or signals.get('long_initial_entry'):
-                        side = 'long'
-                    elif signals.get('short_entry') or signals.get('short_signal') or signals.get('short_initial_entry'):
-                        side = 'short'
-
-                    if side:
-                        quantity = calculate_position_size(current_price, portfolio_values[strategy_name])
-                        if quantity > 0:
-                            portfolio_state[portfolio_key] = {
-                                "is_open": True, "side": side, "entry_date": current_date,
-                                "entry_price": current_price, "quantity": quantity,
-                                "tranches_filled": 1
-                            }
-    
+        symbols.append(symbol)
+        histories.append(historical_data)
+
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(symbols)))
+    logs = open_log_files()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map yields in submission order, so symbols are simulated in universe order
+            precomputed = executor.map(precompute_symbol_signals, symbols, histories)
+
+            # --- Main Progress Bar for ETFs ---
+            for symbol, (data_with_indicators, signal_masks) in tqdm(
+                zip(symbols, precomputed), total=len(symbols), desc="Processing ETFs"
+            ):
+                simulate_symbol(
+                    symbol, data_with_indicators, signal_masks, portfolio_state, portfolio_values, logs
+                )
+    finally:
+        logs.close()
+
     save_portfolio_state(PORTFOLIO_STATE_PATH, portfolio_state)
     logging.info("E2E Strategy Test Finished.")
     logging.info(f"Final Portfolio Values: {json.dumps(portfolio_values, indent=4)}")
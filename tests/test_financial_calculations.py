@@ -0,0 +1,77 @@
+# tests/test_financial_calculations.py
+
+import numpy as np
+import pandas as pd
+
+from utils.financial_calculations import (
+    calculate_bollinger_bands, calculate_indicators, calculate_rsi, calculate_sma
+)
+
+def _reference_rsi(close: pd.Series, length: int) -> pd.Series:
+    """The original pandas RSI, based on simple rolling means of gains and losses."""
+    delta = close.diff()
+    gain = (delta.where(delta > 0, 0)).rolling(window=length).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=length).mean()
+    return 100 - (100 / (1 + gain / loss))
+
+def _reference_percent_b(close: pd.Series, length: int = 20, std_dev: float = 2.0) -> pd.Series:
+    """The original pandas Bollinger Bands %b."""
+    middle = close.rolling(window=length).mean()
+    std = close.rolling(window=length).std()
+    upper = middle + std * std_dev
+    lower = middle - std * std_dev
+    return (close - lower) / (upper - lower)
+
+def test_calculate_indicators_matches_pandas_reference(make_prices):
+    """
+    Tests that the compiled indicator kernels reproduce the pandas rolling
+    implementations exactly, including the NaN warm-up period of each indicator.
+    """
+    data = calculate_indicators(make_prices())
+    close = data["Close"]
+
+    expected = {
+        "SMA_5": close.rolling(window=5).mean(),
+        "SMA_200": close.rolling(window=200).mean(),
+        "RSI_2": _reference_rsi(close, 2),
+        "RSI_4": _reference_rsi(close, 4),
+        "%b": _reference_percent_b(close),
+    }
+    for column, reference in expected.items():
+        np.testing.assert_array_equal(data[column].to_numpy(), reference.to_numpy(), err_msg=column)
+
+def test_rsi_edge_cases_match_pandas_reference():
+    """
+    Tests the RSI at its edges: a window with only gains is 100, a flat
+    window is undefined (NaN), and a missing close is treated as no change.
+    """
+    close = pd.Series([10.0, 11.0, 12.0, 12.0, 12.0, 11.0, np.nan, 11.5, 11.0, 10.5])
+    data = calculate_indicators(pd.DataFrame({"Close": close}))
+
+    np.testing.assert_array_equal(data["RSI_2"].to_numpy(), _reference_rsi(close, 2).to_numpy())
+    assert data["RSI_2"].iloc[2] == 100.0
+    assert np.isnan(data["RSI_2"].iloc[4])
+
+def test_flat_prices_give_undefined_percent_b():
+    """Tests that %b is NaN when the bands collapse on a flat price series."""
+    data = calculate_indicators(pd.DataFrame({"Close": np.full(30, 50.0)}))
+    assert data["%b"].isna().all()
+
+def test_public_indicator_functions_match_pandas_reference(make_prices):
+    """
+    Tests that calculate_sma, calculate_rsi and calculate_bollinger_bands, which
+    now run on the compiled kernels, still equal the pandas rolling formulas and
+    keep the input's index.
+    """
+    close = make_prices()["Close"]
+    middle = close.rolling(window=20).mean()
+    std = close.rolling(window=20).std()
+
+    pd.testing.assert_series_equal(calculate_sma(close, 5), close.rolling(window=5).mean(), check_exact=True)
+    pd.testing.assert_series_equal(calculate_rsi(close, 4), _reference_rsi(close, 4), check_exact=True)
+
+    bands = calculate_bollinger_bands(close)
+    pd.testing.assert_series_equal(bands["BBM_20_2.0"], middle, check_names=False, check_exact=True)
+    pd.testing.assert_series_equal(bands["BBU_20_2.0"], middle + std * 2.0, check_names=False, check_exact=True)
+    pd.testing.assert_series_equal(bands["BBL_20_2.0"], middle - std * 2.0, check_names=False, check_exact=True)
+    pd.testing.assert_series_equal(bands["%b"], _reference_percent_b(close), check_names=False, check_exact=True)
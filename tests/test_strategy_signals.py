@@ -0,0 +1,79 @@
+# tests/test_strategy_signals.py
+
+import pytest
+
+from utils.financial_calculations import calculate_indicators
+from strategies.mdd_mdu import check_mdd_mdu_conditions, compute_mdd_mdu_signals
+from strategies.percent_b_strategy import check_percent_b_conditions, compute_percent_b_signals
+from strategies.r3_strategy import check_r3_conditions, compute_r3_signals
+from strategies.three_day_hl import check_three_day_hl_conditions, compute_three_day_hl_signals
+from strategies.rsi_25_75 import check_rsi_25_75_conditions, compute_rsi_25_75_signals
+from strategies.rsi_10_6_90_94 import check_rsi_10_6_90_94_conditions, compute_rsi_10_6_90_94_signals
+from strategies.tps_strategy import check_tps_conditions
+from strategies.fused import check_all
+
+@pytest.mark.parametrize("check, compute", [
+    (check_mdd_mdu_conditions, compute_mdd_mdu_signals),
+    (check_percent_b_conditions, compute_percent_b_signals),
+    (check_r3_conditions, compute_r3_signals),
+    (check_three_day_hl_conditions, compute_three_day_hl_signals),
+    (check_rsi_25_75_conditions, compute_rsi_25_75_signals),
+    (check_rsi_10_6_90_94_conditions, compute_rsi_10_6_90_94_signals),
+])
+def test_vectorized_signals_match_per_bar_checks(check, compute, make_prices):
+    """
+    Tests that each vectorized signal frame agrees, bar by bar, with the per-bar
+    checker run on the history up to that bar, including the warm-up rows.
+    """
+    data = calculate_indicators(make_prices())
+    signals = compute(data)
+
+    assert list(signals.index) == list(data.index)
+    for t in range(len(data)):
+        expected = check(data.iloc[:t + 1])
+        for column in signals.columns:
+            assert bool(signals[column].iloc[t]) == getattr(expected, column), (column, t)
+
+@pytest.mark.parametrize("compute", [
+    compute_mdd_mdu_signals, compute_percent_b_signals, compute_r3_signals,
+    compute_three_day_hl_signals, compute_rsi_25_75_signals, compute_rsi_10_6_90_94_signals,
+])
+def test_vectorized_signals_are_false_with_a_column_missing(compute, make_prices):
+    """Tests that each vectorized strategy reports no signals, rather than raising, without SMA_200."""
+    data = calculate_indicators(make_prices()).drop(columns=["SMA_200"])
+    signals = compute(data)
+
+    assert list(signals.index) == list(data.index)
+    assert not signals.to_numpy().any()
+
+def test_check_all_matches_individual_checks(make_prices):
+    """
+    Tests that the fused check returns exactly what each strategy's own check
+    returns, on short histories as well as full ones, and with a column missing.
+    """
+    data = calculate_indicators(make_prices())
+    position_state = {"is_open": True, "side": "long", "tranches_filled": 1, "last_entry_price": 120.0}
+    individual = {
+        "3_day_hl": check_three_day_hl_conditions,
+        "rsi_25_75": check_rsi_25_75_conditions,
+        "r3": check_r3_conditions,
+        "percent_b": check_percent_b_conditions,
+        "mdd_mdu": check_mdd_mdu_conditions,
+        "rsi_10_6_90_94": check_rsi_10_6_90_94_conditions,
+    }
+
+    for t, dropped in ((1, []), (3, []), (5, []), (250, []), (len(data), []), (len(data), ['%b'])):
+        window = data.iloc[:t].drop(columns=dropped)
+        fused = check_all(window, position_state)
+        for name, check in individual.items():
+            assert fused[name] == check(window), (name, t)
+        assert fused["tps"] == check_tps_conditions(window, position_state)
+
+def test_check_all_accepts_polars_frames(make_prices):
+    """Tests that a Polars frame yields the same signals as the pandas frame it came from."""
+    pl = pytest.importorskip("polars")
+    data = calculate_indicators(make_prices())
+
+    for t in (1, 5, 250, len(data)):
+        window = data.iloc[:t]
+        assert check_all(pl.from_pandas(window)) == check_all(window), t
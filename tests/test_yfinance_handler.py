@@ -0,0 +1,193 @@
+# tests/test_yfinance_handler.py
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from handlers import yfinance_handler
+from handlers.yfinance_handler import YFinanceHandler, _period_to_offset
+
+TZ = "America/New_York"
+
+@pytest.fixture
+def make_history(make_prices):
+    """Returns a factory for tz-aware daily histories of n bars ending on the previous business day."""
+    def make(n: int, seed: int = 0) -> pd.DataFrame:
+        last = pd.Timestamp.today().normalize() - pd.offsets.BDay(1)
+        prices = make_prices(n, seed=seed, volatility=0.01, spread=0.5, end=last, tz=TZ)
+        return prices.assign(
+            Open=prices["Close"], Volume=np.arange(n, dtype=np.int64), Dividends=0.0, **{"Stock Splits": 0.0}
+        )[["Open", "High", "Low", "Close", "Volume", "Dividends", "Stock Splits"]]
+    return make
+
+def _window(history: pd.DataFrame, period=None, start=None) -> pd.DataFrame:
+    """Slices a history the way Yahoo Finance answers a period or start request."""
+    if start is not None:
+        return history[history.index.date >= start]
+    period_start = pd.Timestamp.now().normalize() - _period_to_offset(period)
+    return history[history.index.tz_localize(None) >= period_start]
+
+class FakeYahoo:
+    """Serves fixed histories through mocked `yf.download` and `yf.Ticker`, recording each request."""
+
+    def __init__(self, histories: dict):
+        self.histories = histories
+        self.calls = []
+
+    def download(self, symbols, period=None, start=None, **kwargs):
+        self.calls.append(("download", tuple(symbols), period, start))
+        frames = {s: _window(self.histories[s], period, start) for s in symbols if s in self.histories}
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+
+    def Ticker(self, symbol, session=None):
+        fake = self
+
+        class _Ticker:
+            def history(self, period=None, start=None, interval="1d"):
+                fake.calls.append(("history", (symbol,), period, start))
+                data = _window(fake.histories[symbol], period, start)
+                return data.assign(**{"Capital Gains": 0.0})
+
+        return _Ticker()
+
+@pytest.fixture
+def yahoo(monkeypatch, make_history):
+    """Replaces the yfinance entry points used by the handler with a FakeYahoo."""
+    fake = FakeYahoo({"SPY": make_history(600, seed=1), "QQQ": make_history(600, seed=2)})
+    monkeypatch.setattr(yfinance_handler.yf, "download", fake.download)
+    monkeypatch.setattr(yfinance_handler.yf, "Ticker", fake.Ticker)
+    return fake
+
+@pytest.fixture
+def handler(tmp_path, monkeypatch):
+    """A handler with its Parquet cache in a temporary directory."""
+    monkeypatch.setattr(yfinance_handler.yf, "set_tz_cache_location", lambda path: None)
+    return YFinanceHandler(cache_dir=str(tmp_path))
+
+def _make_stale(handler: YFinanceHandler, symbol: str, drop_bars: int) -> pd.Timestamp:
+    """Drops the newest bars from a cache file and dates it yesterday. Returns the new last bar."""
+    file_path = handler._get_cache_path(symbol, "1d")
+    cached = pd.read_parquet(file_path).iloc[:-drop_bars]
+    handler._write_cache(file_path, cached, history_start=handler._read_history_start(file_path))
+    yesterday = time.time() - 86400
+    os.utime(file_path, (yesterday, yesterday))
+    return cached.index[-1]
+
+def test_young_symbol_is_not_downloaded_again(handler, yahoo, make_history):
+    """
+    Tests that a symbol with less history than the requested period is served from
+    the cache once its full-period download is cached, in both fetch paths.
+    """
+    yahoo.histories["NEW"] = make_history(100, seed=3)
+
+    first = handler.get_historical_batch(["NEW"], period="1y")
+    yahoo.calls.clear()
+    again = handler.get_historical_batch(["NEW"], period="1y")
+    single = handler.get_historical_data("NEW", period="1y")
+
+    assert yahoo.calls == []
+    assert len(first["NEW"]) == 100
+    pd.testing.assert_frame_equal(again["NEW"], first["NEW"], check_freq=False)
+    pd.testing.assert_frame_equal(single, first["NEW"], check_freq=False)
+
+def test_new_dividend_downloads_the_whole_period_again(handler, yahoo):
+    """
+    Tests that a stale cache is refreshed in full, not appended to, when a new bar
+    carries a dividend, since the cached bars were adjusted before it.
+    """
+    handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+    last_cached = _make_stale(handler, "SPY", drop_bars=3)
+    _make_stale(handler, "QQQ", drop_bars=3)
+    yahoo.histories["SPY"].iloc[-1, yahoo.histories["SPY"].columns.get_loc("Dividends")] = 1.5
+    yahoo.calls.clear()
+
+    result = handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+
+    assert yahoo.calls == [
+        ("download", ("SPY", "QQQ"), None, last_cached.date()),
+        ("download", ("SPY",), "1y", None),
+    ]
+    assert result["SPY"]["Dividends"].iloc[-1] == 1.5
+    assert result["SPY"].index[-1] == yahoo.histories["SPY"].index[-1]
+
+def test_cold_cache_downloads_the_period_once(handler, yahoo):
+    """
+    Tests that symbols without a cache are fetched in one batched full-period
+    request and written to the cache.
+    """
+    result = handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+
+    assert yahoo.calls == [("download", ("SPY", "QQQ"), "1y", None)]
+    for symbol in ("SPY", "QQQ"):
+        expected = _window(yahoo.histories[symbol], period="1y")
+        pd.testing.assert_frame_equal(result[symbol], expected, check_freq=False)
+        assert os.path.exists(handler._get_cache_path(symbol, "1d"))
+
+def test_current_cache_makes_no_requests(handler, yahoo):
+    """Tests that caches updated today with the previous business day's bar are served locally."""
+    first = handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+    yahoo.calls.clear()
+
+    again = handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+    single = handler.get_historical_data("SPY", period="1y")
+
+    assert yahoo.calls == []
+    for symbol in ("SPY", "QQQ"):
+        pd.testing.assert_frame_equal(again[symbol], first[symbol], check_freq=False)
+    pd.testing.assert_frame_equal(single, first["SPY"], check_freq=False)
+
+def test_stale_cache_downloads_only_new_bars(handler, yahoo):
+    """
+    Tests that stale caches ending on the same bar are updated with one batched
+    request starting at that bar, and the result matches a fresh download.
+    """
+    handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+    last_cached = _make_stale(handler, "SPY", drop_bars=3)
+    _make_stale(handler, "QQQ", drop_bars=3)
+    yahoo.calls.clear()
+
+    result = handler.get_historical_batch(["SPY", "QQQ"], period="1y")
+
+    assert yahoo.calls == [("download", ("SPY", "QQQ"), None, last_cached.date())]
+    for symbol in ("SPY", "QQQ"):
+        expected = _window(yahoo.histories[symbol], period="1y")
+        pd.testing.assert_frame_equal(result[symbol], expected, check_freq=False)
+
+def test_cache_date_range_keeps_the_index_time_zone(handler, yahoo):
+    """
+    Tests that the first and last bars read from the Parquet footer come back in
+    the index's own time zone, matching the cached frame.
+    """
+    handler.get_historical_batch(["SPY"], period="1y")
+    file_path = handler._get_cache_path("SPY", "1d")
+    cached = pd.read_parquet(file_path)
+
+    first, last = handler._cache_date_range(file_path)
+
+    assert str(cached.index.tz) == TZ
+    assert (first, last) == (cached.index[0], cached.index[-1])
+    assert str(first.tz) == TZ
+
+def test_stale_caches_are_grouped_by_last_bar(handler, yahoo, make_history):
+    """
+    Tests that the footer's last bar sorts caches into current and stale ones, and
+    that stale caches ending on different bars are fetched in separate requests.
+    """
+    yahoo.histories["IWM"] = make_history(600, seed=4)
+    handler.get_historical_batch(["SPY", "QQQ", "IWM"], period="1y")
+    qqq_last = _make_stale(handler, "QQQ", drop_bars=3)
+    iwm_last = _make_stale(handler, "IWM", drop_bars=5)
+    yahoo.calls.clear()
+
+    result = handler.get_historical_batch(["SPY", "QQQ", "IWM"], period="1y")
+
+    assert yahoo.calls == [
+        ("download", ("QQQ",), None, qqq_last.date()),
+        ("download", ("IWM",), None, iwm_last.date()),
+    ]
+    for symbol in ("SPY", "QQQ", "IWM"):
+        expected = _window(yahoo.histories[symbol], period="1y")
+        pd.testing.assert_frame_equal(result[symbol], expected, check_freq=False)
@@ -0,0 +1,32 @@
+# utils/_frames.py
+
+"""
+Column access that works on both pandas and Polars DataFrames.
+
+The strategy checks only read the last few values of a handful of columns, so
+they take plain NumPy arrays rather than DataFrame rows. Polars is optional: a
+Polars frame is recognized by its `get_column` method, so nothing is imported.
+"""
+
+from typing import Any, Dict, Iterable
+
+import numpy as np
+
+def tail_arrays(data: Any, cols: Iterable[str], n: int) -> Dict[str, np.ndarray]:
+    """
+    Returns the last `n` values of each column in `cols` that `data` contains.
+
+    Args:
+        data (Any): A pandas or Polars DataFrame.
+        cols (Iterable[str]): The column names to read. Missing columns are skipped.
+        n (int): The number of trailing values to keep.
+
+    Returns:
+        Dict[str, np.ndarray]: The trailing values keyed by column name. For numeric
+                               columns without nulls neither library copies the data.
+    """
+    present = set(cols).intersection(data.columns)
+    if hasattr(data, 'get_column'):
+        # Polars: slice before converting, so only the tail is ever materialized
+        return {col: data.get_column(col).tail(n).to_numpy() for col in present}
+    return {col: data[col].to_numpy()[-n:] for col in present}
@@ -0,0 +1,24 @@
+# utils/_njit.py
+
+"""
+Optional Numba support for the numeric kernels in this project.
+
+If Numba is installed, `njit` is Numba's JIT decorator. Otherwise it falls back
+to a no-op decorator, so the same kernels run as plain Python (slower, but with
+identical results).
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - exercised only without numba installed
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """A stand-in for `numba.njit` that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
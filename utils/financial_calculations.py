@@ -2,43 +2,253 @@
 
 """
 A collection of utility functions for calculating financial technical indicators.
-This version calculates indicators manually using pandas, removing the dependency
-on the pandas_ta library.
+This version calculates indicators manually, removing the dependency on the
+pandas_ta library. Every indicator is computed by a Numba-compiled kernel that
+works directly on the NumPy array of closes, in a single O(n) pass.
 """
 
+import numpy as np
 import pandas as pd
+from typing import Tuple
+
+from utils._njit import njit
+
+# Identifies the output of calculate_indicators for anything that caches it.
+# Bump it whenever an indicator's definition or the set of columns changes.
+INDICATORS_VERSION = 1
+# The columns calculate_indicators adds, in order
+INDICATOR_COLUMNS = ('SMA_5', 'SMA_200', 'RSI_2', 'RSI_4', '%b')
 
 def calculate_sma(data: pd.Series, length: int) -> pd.Series:
     """Calculates the Simple Moving Average (SMA)."""
-    return data.rolling(window=length).mean()
+    return pd.Series(_rolling_mean(data.to_numpy(dtype=np.float64), length), index=data.index, name=data.name)
 
 def calculate_rsi(data: pd.Series, length: int) -> pd.Series:
     """Calculates the Relative Strength Index (RSI)."""
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=length).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=length).mean()
-
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return pd.Series(_rsi(data.to_numpy(dtype=np.float64), length), index=data.index, name=data.name)
 
 def calculate_bollinger_bands(data: pd.Series, length: int = 20, std_dev: float = 2.0) -> pd.DataFrame:
     """Calculates Bollinger Bands and the %b value."""
-    middle_band = calculate_sma(data, length)
-    std = data.rolling(window=length).std()
-    upper_band = middle_band + (std * std_dev)
-    lower_band = middle_band - (std * std_dev)
-    
-    percent_b = (data - lower_band) / (upper_band - lower_band)
-    
+    lower_band, middle_band, upper_band, percent_b = _bbands(data.to_numpy(dtype=np.float64), length, std_dev)
+
     bands = pd.DataFrame({
         f'BBL_{length}_{std_dev}': lower_band,
         f'BBM_{length}_{std_dev}': middle_band,
         f'BBU_{length}_{std_dev}': upper_band,
         '%b': percent_b
-    })
+    }, index=data.index)
     return bands
 
+# --- Numba kernels ---
+# These reproduce pandas' own rolling-window algorithms (Kahan-compensated sums
+# for the mean, Welford's method for the variance) so the compiled indicators
+# match `Series.rolling(...).mean()` and `.std()` to the last bit, including
+# windows that contain NaN.
+
+_INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+@njit(cache=True)
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Equivalent of `Series.rolling(window).mean()` on a float64 array."""
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0
+    neg_ct = 0
+    sum_x = 0.0
+    compensation_add = 0.0
+    compensation_remove = 0.0
+    same_value_ct = 0
+    prev_value = values[0] if n > 0 else 0.0
+    for i in range(n):
+        if i >= window:
+            val = values[i - window]
+            if not np.isnan(val):
+                nobs -= 1
+                y = -val - compensation_remove
+                t = sum_x + y
+                compensation_remove = t - sum_x - y
+                sum_x = t
+                if np.signbit(val):
+                    neg_ct -= 1
+
+        val = values[i]
+        if not np.isnan(val):
+            nobs += 1
+            y = val - compensation_add
+            t = sum_x + y
+            compensation_add = t - sum_x - y
+            sum_x = t
+            if np.signbit(val):
+                neg_ct += 1
+            # A run of identical values averages to exactly that value
+            if val == prev_value:
+                same_value_ct += 1
+            else:
+                same_value_ct = 1
+            prev_value = val
+
+        if nobs >= window and nobs > 0:
+            result = sum_x / nobs
+            if same_value_ct >= nobs:
+                result = prev_value
+            elif neg_ct == 0 and result < 0:
+                result = 0.0
+            elif neg_ct == nobs and result > 0:
+                result = 0.0
+            out[i] = result
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True)
+def _rolling_var(values: np.ndarray, window: int, ddof: int = 1) -> np.ndarray:
+    """Equivalent of `Series.rolling(window).var(ddof)` on a float64 array."""
+    n = len(values)
+    out = np.empty(n)
+    nobs = 0.0
+    mean_x = 0.0
+    ssqdm_x = 0.0
+    compensation_add = 0.0
+    compensation_remove = 0.0
+    unstable = False
+    for i in range(n):
+        if i > 0:
+            if i >= window:
+                val = values[i - window]
+                if not np.isnan(val):
+                    prev_m2 = ssqdm_x
+                    nobs -= 1
+                    if nobs:
+                        prev_mean = mean_x - compensation_remove
+                        y = val - compensation_remove
+                        t = y - mean_x
+                        compensation_remove = t + mean_x - y
+                        mean_x -= t / nobs
+                        ssqdm_x -= (val - prev_mean) * (val - mean_x)
+                        if prev_m2 * _INV_COND_TOL > ssqdm_x:
+                            unstable = True
+                    else:
+                        mean_x = 0.0
+                        ssqdm_x = 0.0
+                        unstable = False
+            val = values[i]
+            if not np.isnan(val):
+                prev_m2 = ssqdm_x
+                nobs += 1
+                prev_mean = mean_x - compensation_add
+                y = val - compensation_add
+                t = y - mean_x
+                compensation_add = t + mean_x - y
+                mean_x += t / nobs
+                ssqdm_x += (val - prev_mean) * (val - mean_x)
+                if prev_m2 * _INV_COND_TOL > ssqdm_x:
+                    unstable = True
+
+        if i == 0 or unstable:
+            # Recompute the window from scratch after catastrophic cancellation
+            nobs = 0.0
+            mean_x = 0.0
+            ssqdm_x = 0.0
+            compensation_add = 0.0
+            compensation_remove = 0.0
+            for j in range(max(0, i - window + 1), i + 1):
+                val = values[j]
+                if not np.isnan(val):
+                    nobs += 1
+                    prev_mean = mean_x - compensation_add
+                    y = val - compensation_add
+                    t = y - mean_x
+                    compensation_add = t + mean_x - y
+                    mean_x += t / nobs
+                    ssqdm_x += (val - prev_mean) * (val - mean_x)
+            unstable = False
+
+        if nobs >= window and nobs > ddof:
+            out[i] = ssqdm_x / (nobs - ddof)
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True)
+def _gains_losses(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """The bar-to-bar gains and losses (as positive values) of a close array."""
+    n = len(close)
+    gains = np.zeros(n)
+    losses = np.zeros(n)
+    for i in range(1, n):
+        # A NaN change is neither a gain nor a loss, as with Series.where
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            gains[i] = delta
+        if delta < 0:
+            losses[i] = -delta
+        else:
+            # Negating the zero-filled series leaves -0.0 here
+            losses[i] = -0.0
+    if n > 0:
+        losses[0] = -0.0
+    return gains, losses
+
+
+@njit(cache=True)
+def _rsi_from_changes(gains: np.ndarray, losses: np.ndarray, length: int) -> np.ndarray:
+    """
+    The RSI step of `_rsi`, given gains and losses already split by `_gains_losses`.
+    `_compute_all` splits them once and shares them across RSI lengths.
+    """
+    rs = _rolling_mean(gains, length) / _rolling_mean(losses, length)
+    return 100 - (100 / (1 + rs))
+
+
+@njit(cache=True)
+def _rsi(close: np.ndarray, length: int) -> np.ndarray:
+    """RSI from the simple rolling mean of gains and losses over `length` bars."""
+    gains, losses = _gains_losses(close)
+    return _rsi_from_changes(gains, losses, length)
+
+
+# NumPy's error model makes a zero-width band give NaN/inf instead of raising
+@njit(cache=True, error_model='numpy')
+def _bbands(
+    close: np.ndarray, length: int, std_dev: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bollinger Bands using the sample standard deviation over `length` bars.
+    Returns the lower, middle and upper bands and %b.
+    """
+    n = len(close)
+    middle = _rolling_mean(close, length)
+    var = _rolling_var(close, length, 1)
+    lower = np.empty(n)
+    upper = np.empty(n)
+    percent_b = np.empty(n)
+    for i in range(n):
+        band = np.sqrt(max(var[i], 0.0)) * std_dev
+        upper[i] = middle[i] + band
+        lower[i] = middle[i] - band
+        percent_b[i] = (close[i] - lower[i]) / (upper[i] - lower[i])
+    return lower, middle, upper, percent_b
+
+
+@njit(cache=True)
+def _compute_all(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Computes every indicator the strategies read in one compiled call, sharing the
+    gains and losses between both RSI periods.
+    Returns SMA_5, SMA_200, RSI_2, RSI_4 and %b.
+    """
+    gains, losses = _gains_losses(close)
+    return (
+        _rolling_mean(close, 5),
+        _rolling_mean(close, 200),
+        _rsi_from_changes(gains, losses, 2),
+        _rsi_from_changes(gains, losses, 4),
+        _bbands(close, 20, 2.0)[3],
+    )
+
+
 def calculate_indicators(data: pd.DataFrame) -> pd.DataFrame:
     """
     Calculates all required technical indicators for the trading strategies.
@@ -53,20 +263,13 @@ def calculate_indicators(data: pd.DataFrame) -> pd.DataFrame:
                              'High', 'Low', and 'Close' columns.
 
     Returns:
-        pd.DataFrame: The original DataFrame with added columns for each indicator.
-                      Returns the original DataFrame if data is insufficient.
+        pd.DataFrame: A new DataFrame with the original columns and a column for each
+                      indicator. Returns the original DataFrame if data is insufficient.
     """
     if 'Close' not in data.columns or data.empty:
         return data
 
-    # Calculate indicators using our own functions
-    data['SMA_5'] = calculate_sma(data['Close'], 5)
-    data['SMA_200'] = calculate_sma(data['Close'], 200)
-    data['RSI_2'] = calculate_rsi(data['Close'], 2)
-    data['RSI_4'] = calculate_rsi(data['Close'], 4)
-    
-    # Calculate Bollinger Bands and %b
-    bbands = calculate_bollinger_bands(data['Close'], length=20, std_dev=2.0)
-    data['%b'] = bbands['%b']
-
-    return data
+    # Calculate indicators with the compiled kernels on the raw close array
+    close = data['Close'].to_numpy(dtype=np.float64)
+    # Add every column in one call rather than inserting them one at a time
+    return data.assign(**dict(zip(INDICATOR_COLUMNS, _compute_all(close))))